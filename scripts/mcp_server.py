@@ -10,23 +10,44 @@ Tools:
     query           - Execute SQL query
     get_periods     - Get available periods for a dataset
     get_lineage     - Get data lineage: source, loads, enrichment history
+    clear_cache     - Drop cached listings and metadata
 """
+import asyncio
 import json
 import logging
 import os
 import sys
-from typing import Any, Dict, List
+import threading
+import time
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+from weakref import WeakSet
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
+# Label this process's connections in pg_stat_activity (libpq reads PGAPPNAME)
+os.environ.setdefault('PGAPPNAME', 'datawarp-mcp')
+
+from psycopg2 import errors as pg_errors
+from psycopg2 import sql as pgsql
+
+try:
+    import orjson  # optional: faster JSON for large query results
+except ImportError:
+    orjson = None
+
 from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-from datawarp.storage import get_connection
-from datawarp.metadata import get_table_metadata
-from datawarp.pipeline import list_configs
+from datawarp.discovery import CACHE_DIR
+from datawarp.storage import get_connection, init_pool, close_pool
+from datawarp.metadata import get_table_metadata, clear_metadata_cache
+from datawarp.pipeline import list_configs, get_configs_version
+from datawarp.utils import is_single_select, strip_trailing_terminator
 
 # Configure logging to stderr (stdout is reserved for MCP protocol)
 logging.basicConfig(
@@ -39,105 +60,389 @@ logger = logging.getLogger(__name__)
 # Create MCP server
 app = Server("datawarp-nhs")
 
-
-def list_datasets(schema: str = 'staging') -> List[Dict]:
-    """List all available datasets with descriptions from saved configs."""
-    results = []
-
-    # Build mapping from saved configs (table_name -> (config, SheetMapping))
-    configs = list_configs()
-    config_map = {}
-    for cfg in configs:
+# query() switches to a server-side cursor above this many rows
+STREAM_MIN_LIMIT = 10000
+STREAM_BATCH_ROWS = 1000  # rows per round-trip when streaming
+
+# Tool results are compact JSON; indenting roughly doubles size and encode time
+PRETTY_JSON = os.getenv('DATAWARP_MCP_PRETTY_JSON', '').lower() in ('1', 'true', 'yes')
+
+# Most recent loads returned by get_lineage
+LINEAGE_MAX_LOADS = 500
+
+# Tables per UNION ALL statement when counting rows or listing periods across a
+# schema - keeps each statement a manageable size for the parser and planner
+UNION_BATCH_TABLES = 50
+
+# Dataset listings and period lists scan the period column of the tables they
+# cover. Results are reused for DATASETS_CACHE_TTL without checks, then for as
+# long as the schema's data version token (configs, tables and write counters)
+# is unchanged.
+DATASETS_CACHE_TTL = 10  # seconds
+# Entries are dropped once their schema's data version moves on, and the
+# soonest-expiring ones beyond this many per cache (e.g. one per table asked for)
+RESULTS_CACHE_MAX_ENTRIES = 256
+_datasets_cache: Dict[tuple, tuple] = {}  # (schema, exact) -> (expires_at, version, datasets)
+_periods_cache: Dict[tuple, tuple] = {}  # (schema, table) -> (expires_at, version, periods)
+_results_cache_lock = threading.Lock()
+
+# Unfiltered listing saved by --refresh-snapshot; a new server process starts
+# from it instead of scanning every table, as long as its data version matches
+SNAPSHOT_PATH = CACHE_DIR / 'mcp_snapshot.json'
+
+
+# table_name -> (config, file_pattern, sheet_mapping, column_counts, column_lookup),
+# rebuilt when configs change
+_config_index_cache: tuple = (None, {})  # (configs version, index)
+_config_index_lock = threading.Lock()
+
+
+def clear_cache() -> None:
+    """Drop cached dataset listings, period lists, config index and table metadata."""
+    global _config_index_cache
+    with _results_cache_lock:
+        _datasets_cache.clear()
+        _periods_cache.clear()
+    with _config_index_lock:
+        _config_index_cache = (None, {})
+    clear_metadata_cache()
+
+
+def _config_index() -> Dict[str, tuple]:
+    """
+    Map each table to the saved config that loads it.
+
+    Configs are only re-read when their version token changes (another
+    process saved or deleted one), not on every tool call.
+    """
+    global _config_index_cache
+    version = get_configs_version()
+    with _config_index_lock:
+        cached_version, index = _config_index_cache
+    if cached_version == version:
+        return index
+
+    index = {}
+    for cfg in list_configs():
         for fp in cfg.file_patterns:
             for sm in fp.sheet_mappings:
-                config_map[sm.table_name] = (cfg, sm)
+                index[sm.table_name] = (cfg, fp, sm, _column_counts(sm), _column_lookup(sm))
+    with _config_index_lock:
+        _config_index_cache = (version, index)
+    return index
+
+
+def _lookup_by_table(table_name: str) -> tuple:
+    """Config index entry for the mapping that loads table_name, or all Nones."""
+    return _config_index().get(table_name, (None,) * 5)
+
+
+def _column_counts(sm) -> Dict[str, int]:
+    """Enrichment progress for a sheet mapping - computed once per index build."""
+    mappings = sm.column_mappings
+    descriptions = sm.column_descriptions
+    return {
+        'columns_total': len(mappings),
+        'columns_enriched': sum(1 for k, v in mappings.items() if k != v),
+        'columns_pending': sum(
+            1 for col, mapped in mappings.items()
+            if not descriptions.get(col) and not descriptions.get(mapped)
+        ),
+    }
+
+
+def _column_lookup(sm) -> Dict[str, tuple]:
+    """Loaded column name -> (original source name, description or None) for get_schema."""
+    original_names = {v: k for k, v in sm.column_mappings.items()}
+    descriptions = sm.column_descriptions
+    lookup = {}
+    for name in original_names.keys() | descriptions.keys():
+        original = original_names.get(name, name)
+        if name in descriptions:
+            lookup[name] = (original, descriptions[name])
+        else:
+            lookup[name] = (original, descriptions.get(original))
+    return lookup
+
+
+def list_datasets(
+    schema: str = 'staging',
+    exact: bool = False,
+    name_prefix: Optional[str] = None,
+    only_enriched: bool = False,
+    changed_since: Optional[str] = None,
+) -> List[Dict]:
+    """
+    List all available datasets with descriptions from saved configs.
+
+    row_count is the planner's estimate (pg_class.reltuples) unless exact=True,
+    which runs COUNT(*) on every table.
+
+    name_prefix, only_enriched (tables with LLM-renamed columns) and
+    changed_since (ISO date/timestamp of the latest load) narrow the table
+    list before any counting or period scans.
+    """
+    key = (schema, exact, name_prefix, only_enriched, changed_since)
+    if not (name_prefix or only_enriched or changed_since):
+        _seed_from_snapshot(key)
+    results = _versioned(_datasets_cache, key, schema, lambda: _query_datasets(
+        schema, exact, name_prefix, only_enriched, changed_since))
+    return [dict(d) for d in results]
+
+
+def _seed_from_snapshot(key: tuple) -> None:
+    """Put the saved snapshot in an empty cache slot; _versioned checks its version before use."""
+    with _results_cache_lock:
+        if key in _datasets_cache:
+            return
+    try:
+        snapshot = json.loads(SNAPSHOT_PATH.read_text())
+    except (OSError, ValueError):
+        return
+    if snapshot.get('schema') != key[0]:
+        return
+    with _results_cache_lock:
+        # Expired on arrival, so the version is compared before it is served
+        _datasets_cache.setdefault(key, (0.0, tuple(snapshot['version']), snapshot['datasets']))
+
+
+def write_snapshot(schema: str = 'staging') -> int:
+    """Save the unfiltered listing (exact row counts) for new server processes; returns table count."""
+    version = _data_version(schema)
+    datasets = _query_datasets(schema, exact=True)
+    SNAPSHOT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SNAPSHOT_PATH.with_name(SNAPSHOT_PATH.name + '.part')
+    tmp_path.write_text(json.dumps({'schema': schema, 'version': version, 'datasets': datasets}, default=str))
+    os.replace(tmp_path, SNAPSHOT_PATH)
+    return len(datasets)
+
+
+def _versioned(cache: Dict[tuple, tuple], key: tuple, schema: str, build):
+    """Cached build() result for key, rebuilt only when the schema's data version changes."""
+    with _results_cache_lock:
+        cached = cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[2]
+
+    version = _data_version(schema)
+    unchanged = cached and cached[1] == version
+    result = cached[2] if unchanged else build()
+    with _results_cache_lock:
+        cache[key] = (time.monotonic() + DATASETS_CACHE_TTL, version, result)
+        if not unchanged:
+            _evict(cache, schema, version)
+    return result
+
+
+def _evict(cache: Dict[tuple, tuple], schema: str, version: tuple) -> None:
+    """Drop the schema's entries from older data versions, then any over the size cap (hold the lock)."""
+    for key in [k for k, entry in cache.items() if k[0] == schema and entry[1] != version]:
+        del cache[key]
+    excess = len(cache) - RESULTS_CACHE_MAX_ENTRIES
+    if excess > 0:
+        for key in sorted(cache, key=lambda k: cache[k][0])[:excess]:
+            del cache[key]
+
+
+def _data_version(schema: str) -> tuple:
+    """Cheap change token for a schema's tables and the saved configs."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            _execute_prepared(cur, 'dw_version', (schema,))
+            return tuple(cur.fetchone())
+
+
+def _query_datasets(
+    schema: str,
+    exact: bool = False,
+    name_prefix: Optional[str] = None,
+    only_enriched: bool = False,
+    changed_since: Optional[str] = None,
+) -> List[Dict]:
+    """Build the dataset listing from the database and saved configs."""
+    results = []
+    config_map = _config_index()
 
     with get_connection() as conn:
         with conn.cursor() as cur:
-            # Get all tables
-            cur.execute("""
-                SELECT table_name
-                FROM information_schema.tables
-                WHERE table_schema = %s AND table_type = 'BASE TABLE'
-                ORDER BY table_name
-            """, (schema,))
-            tables = [row[0] for row in cur.fetchall()]
-
-            for table in tables:
-                # Get row count
-                cur.execute(f"SELECT COUNT(*) FROM {schema}.{table}")
-                row_count = cur.fetchone()[0]
-
-                # Check for period column and get distinct periods
-                cur.execute("""
-                    SELECT column_name FROM information_schema.columns
-                    WHERE table_schema = %s AND table_name = %s AND column_name = 'period'
-                """, (schema, table))
-
-                periods = []
-                if cur.fetchone():
-                    cur.execute(f"SELECT DISTINCT period FROM {schema}.{table} ORDER BY period")
-                    periods = [row[0] for row in cur.fetchall()]
-
-                # Get description from config or infer
-                if table in config_map:
-                    cfg, sm = config_map[table]
-                    desc = sm.table_description or _infer_table_description(table)
-                    grain = sm.grain
-                    grain_desc = sm.grain_description
-                    has_enriched = any(k != v for k, v in sm.column_mappings.items())
-                    result = {
-                        'name': table,
-                        'description': desc,
-                        'grain': grain,
-                        'grain_description': grain_desc,
-                        'row_count': row_count,
-                        'periods': periods,
-                        'pipeline_id': cfg.pipeline_id,
-                        'publication_name': cfg.name,
-                        'landing_page': cfg.landing_page,
-                        'has_enriched_columns': has_enriched,
-                        'mappings_version': sm.mappings_version,
-                    }
-                else:
-                    result = {
-                        'name': table,
-                        'description': _infer_table_description(table),
-                        'grain': 'unknown',
-                        'grain_description': '',
-                        'row_count': row_count,
-                        'periods': periods,
-                        'pipeline_id': None,
-                        'publication_name': None,
-                        'landing_page': None,
-                        'has_enriched_columns': False,
-                        'mappings_version': None,
-                    }
-
-                results.append(result)
+            # All tables, flagging those with a period column - one catalog query
+            _execute_prepared(cur, 'dw_tables', (schema,))
+            table_rows = cur.fetchall()
+            tables = [name for name, _ in table_rows]
+
+            # Filters drop tables before the count and period scans
+            if name_prefix:
+                tables = [t for t in tables if t.startswith(name_prefix)]
+            if only_enriched:
+                tables = [t for t in tables if t in config_map and config_map[t][3]['columns_enriched']]
+            if changed_since:
+                cur.execute(
+                    "SELECT DISTINCT table_name FROM datawarp.tbl_load_history WHERE loaded_at >= %s",
+                    (changed_since,),
+                )
+                changed = {row[0] for row in cur.fetchall()}
+                tables = [t for t in tables if t in changed]
+            listed = set(tables)
+            period_tables = [name for name, has_period in table_rows if has_period and name in listed]
+
+            if exact:
+                row_counts = _union_counts(cur, schema, tables)
+            else:
+                row_counts = _estimated_counts(cur, schema)
+                # Never-analyzed tables have no estimate (-1) - count those exactly
+                unknown = [t for t in tables if row_counts.get(t, -1) < 0]
+                row_counts.update(_union_counts(cur, schema, unknown))
+            periods_by_table = _union_periods(cur, schema, period_tables)
+
+    for table in tables:
+        row_count = row_counts.get(table, 0)
+        periods = periods_by_table.get(table, [])
+
+        # Get description from config or infer
+        if table in config_map:
+            cfg, _, sm, counts, _ = config_map[table]
+            desc = sm.table_description or _infer_table_description(table)
+            grain = sm.grain
+            grain_desc = sm.grain_description
+            has_enriched = counts['columns_enriched'] > 0
+            result = {
+                'name': table,
+                'description': desc,
+                'grain': grain,
+                'grain_description': grain_desc,
+                'row_count': row_count,
+                'periods': periods,
+                'pipeline_id': cfg.pipeline_id,
+                'publication_name': cfg.name,
+                'landing_page': cfg.landing_page,
+                'has_enriched_columns': has_enriched,
+                'mappings_version': sm.mappings_version,
+            }
+        else:
+            result = {
+                'name': table,
+                'description': _infer_table_description(table),
+                'grain': 'unknown',
+                'grain_description': '',
+                'row_count': row_count,
+                'periods': periods,
+                'pipeline_id': None,
+                'publication_name': None,
+                'landing_page': None,
+                'has_enriched_columns': False,
+                'mappings_version': None,
+            }
+
+        results.append(result)
 
     return results
 
 
-def get_schema(table_name: str, schema: str = 'staging') -> Dict:
-    """Get detailed schema information for a table."""
-    configs = list_configs()
-    sheet_mapping = None
-    parent_config = None
-    for cfg in configs:
-        for fp in cfg.file_patterns:
-            for sm in fp.sheet_mappings:
-                if sm.table_name == table_name:
-                    sheet_mapping = sm
-                    parent_config = cfg
-                    break
+# Hot catalog and history queries, prepared once per connection and then
+# executed by name - pooled connections skip parse and plan on every call
+_PREPARED_SQL = {
+    # All tables in a schema, flagging those with a period column
+    'dw_tables': """
+        SELECT t.table_name, EXISTS (
+            SELECT 1 FROM information_schema.columns c
+            WHERE c.table_schema = t.table_schema AND c.table_name = t.table_name
+              AND c.column_name = 'period'
+        )
+        FROM information_schema.tables t
+        WHERE t.table_schema = $1 AND t.table_type = 'BASE TABLE'
+        ORDER BY t.table_name
+    """,
+    # Planner row estimates for every table in a schema
+    'dw_estimates': """
+        SELECT c.relname, c.reltuples::bigint
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE n.nspname = $1 AND c.relkind IN ('r', 'p')
+    """,
+    # Data version token: tables and their write counters in a schema, plus
+    # saved configs. Loads insert rows, resets drop tables, saves bump updated_at.
+    'dw_version': """
+        SELECT s.tables, s.writes, c.configs, c.updated_at::text
+        FROM (
+            SELECT COUNT(*) AS tables, COALESCE(SUM(n_tup_ins + n_tup_upd + n_tup_del), 0)::bigint AS writes
+            FROM pg_stat_user_tables WHERE schemaname = $1
+        ) s, (
+            SELECT COUNT(*) AS configs, MAX(updated_at) AS updated_at
+            FROM datawarp.tbl_pipeline_configs
+        ) c
+    """,
+    # Load history for one table, newest first
+    'dw_loads': """
+        SELECT period, source_file, sheet_name, rows_loaded, loaded_at
+        FROM datawarp.tbl_load_history
+        WHERE table_name = $1
+        ORDER BY loaded_at DESC
+        LIMIT $2
+    """,
+}
+_prepared_on: Dict[str, WeakSet] = {name: WeakSet() for name in _PREPARED_SQL}
+
+
+def _execute_prepared(cur, name: str, params: tuple) -> None:
+    """EXECUTE a statement from _PREPARED_SQL, preparing it on first use per connection."""
+    conn = cur.connection
+    if conn not in _prepared_on[name]:
+        # Prepared statements belong to the session and survive rollback
+        cur.execute(f"PREPARE {name} AS {_PREPARED_SQL[name]}")
+        _prepared_on[name].add(conn)
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+
+def _union_counts(cur, schema: str, tables: List[str]) -> Dict[str, int]:
+    """Row counts for many tables, UNION_BATCH_TABLES per round-trip (UNION ALL of COUNT(*))."""
+    counts: Dict[str, int] = {}
+    for start in range(0, len(tables), UNION_BATCH_TABLES):
+        cur.execute(pgsql.SQL(" UNION ALL ").join(
+            pgsql.SQL("SELECT {}, COUNT(*) FROM {}.{}").format(
+                pgsql.Literal(table), pgsql.Identifier(schema), pgsql.Identifier(table))
+            for table in tables[start:start + UNION_BATCH_TABLES]
+        ))
+        counts.update(cur.fetchall())
+    return counts
+
+
+def _estimated_counts(cur, schema: str) -> Dict[str, int]:
+    """Planner row estimates for every table in a schema - one catalog lookup, no scans."""
+    _execute_prepared(cur, 'dw_estimates', (schema,))
+    return dict(cur.fetchall())
+
+
+def _union_periods(cur, schema: str, tables: List[str]) -> Dict[str, List[str]]:
+    """
+    Sorted distinct periods for many tables, UNION_BATCH_TABLES per round-trip.
+
+    Each table comes back as one row holding its periods as an array, rather
+    than one row per (table, period).
+    """
+    periods: Dict[str, List[str]] = {}
+    for start in range(0, len(tables), UNION_BATCH_TABLES):
+        cur.execute(pgsql.SQL(" UNION ALL ").join(
+            pgsql.SQL("SELECT {}, array_agg(DISTINCT period::text ORDER BY period::text) FROM {}.{}").format(
+                pgsql.Literal(table), pgsql.Identifier(schema), pgsql.Identifier(table))
+            for table in tables[start:start + UNION_BATCH_TABLES]
+        ))
+        for table, table_periods in cur.fetchall():
+            if table_periods:  # NULL for an empty table
+                periods[table] = table_periods
+    return periods
+
+
+def get_schema(table_name: str, schema: str = 'staging', compact: bool = False) -> Dict:
+    """
+    Get detailed schema information for a table.
+
+    compact=True returns columns as parallel lists (see _columns_as_arrays)
+    instead of one dict per column - much smaller for wide tables.
+    """
+    parent_config, _, sheet_mapping, _, column_lookup = _lookup_by_table(table_name)
 
     metadata = get_table_metadata(table_name, schema)
 
-    reverse_mappings = {}
-    if sheet_mapping:
-        reverse_mappings = {v: k for k, v in sheet_mapping.column_mappings.items()}
-
     if sheet_mapping and parent_config:
         metadata['description'] = sheet_mapping.table_description or metadata.get('description', '')
         metadata['grain'] = sheet_mapping.grain
@@ -165,13 +470,11 @@ def get_schema(table_name: str, schema: str = 'staging') -> Dict:
 
         for col in metadata.get('columns', []):
             col_name = col['name']
-            original_name = reverse_mappings.get(col_name, col_name)
+            original_name, description = column_lookup.get(col_name, (col_name, None))
             col['original_name'] = original_name
             col['is_enriched'] = original_name != col_name
-            if col_name in sheet_mapping.column_descriptions:
-                col['description'] = sheet_mapping.column_descriptions[col_name]
-            elif original_name in sheet_mapping.column_descriptions:
-                col['description'] = sheet_mapping.column_descriptions[original_name]
+            if description is not None:
+                col['description'] = description
     else:
         metadata['pipeline_id'] = None
         metadata['publication_name'] = None
@@ -183,76 +486,146 @@ def get_schema(table_name: str, schema: str = 'staging') -> Dict:
             col['original_name'] = col['name']
             col['is_enriched'] = False
 
+    if compact:
+        metadata['columns'] = _columns_as_arrays(metadata.get('columns', []))
     return metadata
 
 
+def _columns_as_arrays(columns: List[Dict]) -> Dict[str, list]:
+    """
+    Structure-of-arrays form of get_schema columns: one list per field, in
+    column order, and the positions of enriched columns instead of a flag each.
+    """
+    return {
+        'names': [col['name'] for col in columns],
+        'types': [col['type'] for col in columns],
+        'original_names': [col['original_name'] for col in columns],
+        'descriptions': [col['description'] for col in columns],
+        'sample_values': [col['sample_values'] for col in columns],
+        'enriched': [i for i, col in enumerate(columns) if col['is_enriched']],
+    }
+
+
 def query(sql: str, limit: int = 1000) -> Dict:
     """Execute a SQL query and return results."""
-    sql_upper = sql.strip().upper()
-    if not sql_upper.startswith('SELECT'):
-        return {'error': 'Only SELECT queries are allowed'}
+    if not is_single_select(sql):
+        return {'error': 'Only single SELECT queries (optionally WITH ... SELECT) are allowed'}
 
-    if 'LIMIT' not in sql_upper:
-        sql = f"{sql.rstrip(';')} LIMIT {limit}"
+    # Run it as a subquery under our own LIMIT (one row over, to detect
+    # truncation). This caps any LIMIT of its own, and if the text still hides a
+    # second statement from is_single_select, the server sees unbalanced
+    # parentheses and rejects the whole string before running any of it.
+    # The trailing ';' and comments go first - 'SELECT 1; -- c' is one statement.
+    sql = f"SELECT * FROM (\n{strip_trailing_terminator(sql)}\n) AS dw_query LIMIT {limit + 1}"
+
+    # A client cursor receives the whole result set on execute. For a big limit
+    # use a server-side cursor and fetch in batches instead.
+    stream = limit > STREAM_MIN_LIMIT
 
     with get_connection() as conn:
+        # Read-only for this transaction only - catches writes the text checks can't
+        # see (CTEs, functions) without leaving session state on a pooled connection.
+        # Standard strings ('\' is not an escape) so the server splits the text
+        # the way is_single_select did, whatever an earlier set_config() left behind.
         with conn.cursor() as cur:
+            cur.execute("SET TRANSACTION READ ONLY; SET LOCAL standard_conforming_strings = on")
+        with conn.cursor(name=f"dw_query_{uuid4().hex}") if stream else conn.cursor() as cur:
             try:
+                if stream:
+                    cur.itersize = STREAM_BATCH_ROWS
                 cur.execute(sql)
+                rows = list(islice(cur, limit + 1))
+                # Named cursors only describe their columns after the first fetch
                 columns = [desc[0] for desc in cur.description]
-                rows = cur.fetchall()
-
-                rows_serializable = []
-                for row in rows:
-                    row_dict = {}
-                    for i, val in enumerate(row):
-                        if hasattr(val, 'isoformat'):
-                            val = val.isoformat()
-                        elif isinstance(val, (bytes, bytearray)):
-                            val = val.decode('utf-8', errors='replace')
-                        row_dict[columns[i]] = val
-                    rows_serializable.append(row_dict)
+                truncated = len(rows) > limit
+                rows = rows[:limit]
+
+                # Pick each column's JSON conversion once from its type, not per cell.
+                # Rows are zipped straight into dicts and only the columns that
+                # need converting are revisited (a repeated name keeps its last column).
+                by_name = {name: _CONVERTERS.get(desc.type_code, _identity)
+                           for name, desc in zip(columns, cur.description)}
+                rows_serializable = [dict(zip(columns, row)) for row in rows]
+                for name, convert in by_name.items():
+                    if convert is not _identity:
+                        for row_dict in rows_serializable:
+                            row_dict[name] = convert(row_dict[name])
 
                 return {
                     'columns': columns,
                     'rows': rows_serializable,
                     'row_count': len(rows),
+                    'truncated': truncated,
                 }
             except Exception as e:
                 return {'error': str(e)}
 
 
+def _identity(val):
+    return val
+
+
+def _iso(val):
+    return val.isoformat() if val is not None else None
+
+
+def _decode(val):
+    # bytea arrives as memoryview
+    return bytes(val).decode('utf-8', errors='replace') if val is not None else None
+
+
+# Postgres type OID -> converter for values json.dumps can't emit as-is.
+# orjson writes dates, times and datetimes itself (same ISO format), but it
+# rejects tz-aware times outright (without calling default), so timetz always converts.
+_CONVERTERS = {
+    17: _decode,    # bytea
+    1266: _iso,     # timetz
+}
+if orjson is None:
+    _CONVERTERS.update({
+        1082: _iso,     # date
+        1083: _iso,     # time
+        1114: _iso,     # timestamp
+        1184: _iso,     # timestamptz
+    })
+
+
+def _dumps(result, pretty: bool = PRETTY_JSON) -> str:
+    """Serialize a tool result - orjson when installed, json otherwise."""
+    if orjson is not None:
+        return orjson.dumps(result, default=str, option=orjson.OPT_INDENT_2 if pretty else None).decode()
+    if pretty:
+        return json.dumps(result, indent=2, default=str)
+    return json.dumps(result, separators=(',', ':'), default=str)
+
+
 def get_periods(table_name: str, schema: str = 'staging') -> List[str]:
     """Get list of available periods for a table."""
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            cur.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s AND column_name = 'period'
-            """, (schema, table_name))
+    return list(_versioned(_periods_cache, (schema, table_name), schema,
+                           lambda: _query_periods(table_name, schema)))
+
+
+def _query_periods(table_name: str, schema: str) -> List[str]:
+    """Distinct periods of a table, sorted ([] if it has no period column)."""
+    # One round-trip: a table without a period column (or no table at all)
+    # fails to plan, which is cheaper than checking the catalog first.
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(pgsql.SQL("SELECT DISTINCT period FROM {}.{} ORDER BY period").format(
+                    pgsql.Identifier(schema), pgsql.Identifier(table_name)))
+                return [row[0] for row in cur.fetchall()]
+    except (pg_errors.UndefinedColumn, pg_errors.UndefinedTable):
+        return []
 
-            if not cur.fetchone():
-                return []
 
-            cur.execute(f"SELECT DISTINCT period FROM {schema}.{table_name} ORDER BY period")
-            return [row[0] for row in cur.fetchall()]
+# get_lineage load entries, in dw_loads column order
+_LOAD_COLS = ('period', 'file', 'sheet', 'rows', 'loaded_at')
 
 
 def get_lineage(table_name: str) -> Dict:
     """Get complete lineage information for a table."""
-    configs = list_configs()
-    sheet_mapping = None
-    parent_config = None
-    file_pattern_info = None
-
-    for cfg in configs:
-        for fp in cfg.file_patterns:
-            for sm in fp.sheet_mappings:
-                if sm.table_name == table_name:
-                    sheet_mapping = sm
-                    parent_config = cfg
-                    file_pattern_info = fp
-                    break
+    parent_config, file_pattern_info, sheet_mapping, column_counts, _ = _lookup_by_table(table_name)
 
     if parent_config and sheet_mapping and file_pattern_info:
         source = {
@@ -263,20 +636,10 @@ def get_lineage(table_name: str) -> Dict:
             'file_patterns': file_pattern_info.filename_patterns,
         }
 
-        total_cols = len(sheet_mapping.column_mappings)
-        enriched_cols = sum(1 for k, v in sheet_mapping.column_mappings.items() if k != v)
-        pending_cols = sum(
-            1 for col in sheet_mapping.column_mappings.keys()
-            if not sheet_mapping.column_descriptions.get(col)
-            and not sheet_mapping.column_descriptions.get(sheet_mapping.column_mappings.get(col, col))
-        )
-
         enrichment = {
             'version': sheet_mapping.mappings_version,
             'last_enriched': sheet_mapping.last_enriched,
-            'columns_total': total_cols,
-            'columns_enriched': enriched_cols,
-            'columns_pending': pending_cols,
+            **column_counts,
         }
     else:
         source = {
@@ -294,24 +657,15 @@ def get_lineage(table_name: str) -> Dict:
             'columns_pending': 0,
         }
 
-    loads = []
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                SELECT period, source_file, sheet_name, rows_loaded, loaded_at
-                FROM datawarp.tbl_load_history
-                WHERE table_name = %s
-                ORDER BY loaded_at DESC
-            """, (table_name,))
-
-            for row in cur.fetchall():
-                loads.append({
-                    'period': row[0],
-                    'file': row[1],
-                    'sheet': row[2],
-                    'rows': row[3],
-                    'loaded_at': row[4].isoformat() if row[4] else None,
-                })
+            _execute_prepared(cur, 'dw_loads', (table_name, LINEAGE_MAX_LOADS))
+            rows = cur.fetchall()
+
+    loads = [dict(zip(_LOAD_COLS, row)) for row in rows]
+    # ISO strings whichever JSON encoder is used (test_mode slices them too)
+    for load in loads:
+        load['loaded_at'] = _iso(load['loaded_at'])
 
     # Include file_context if available (extracted from Notes/Contents sheets)
     file_context = parent_config.file_context if parent_config else None
@@ -331,95 +685,159 @@ def get_lineage(table_name: str) -> Dict:
     }
 
 
-def _infer_table_description(table_name: str) -> str:
-    """Infer a description from table name."""
-    name = table_name.replace('tbl_', '')
-    parts = name.split('_')
-
-    if 'adhd' in parts:
-        base = 'ADHD referral data'
-    elif 'waiting' in parts:
-        base = 'Waiting list data'
-    elif 'mental' in parts or 'mh' in parts:
-        base = 'Mental health data'
-    else:
-        base = ' '.join(parts).title() + ' data'
+# Table-name tokens -> description parts, in priority order (first match wins)
+_BASE_TOKENS = {
+    'adhd': 'ADHD referral data',
+    'waiting': 'Waiting list data',
+    'mental': 'Mental health data',
+    'mh': 'Mental health data',
+}
+_LEVEL_TOKENS = {
+    'icb': 'ICB level',
+    'trust': 'Trust level',
+    'provider': 'provider level',
+    'national': 'national level',
+}
+
 
-    if 'icb' in parts:
-        return f"{base} at ICB level"
-    elif 'trust' in parts:
-        return f"{base} at Trust level"
-    elif 'provider' in parts:
-        return f"{base} at provider level"
-    elif 'national' in parts:
-        return f"{base} at national level"
+@lru_cache(maxsize=512)
+def _infer_table_description(table_name: str) -> str:
+    """Infer a description from table name (memoized - depends only on the name)."""
+    parts = table_name.replace('tbl_', '').split('_')
+    words = set(parts)
 
-    return base
+    base = next((desc for token, desc in _BASE_TOKENS.items() if token in words), None)
+    if base is None:
+        base = ' '.join(parts).title() + ' data'
+    level = next((desc for token, desc in _LEVEL_TOKENS.items() if token in words), None)
+    return f"{base} at {level}" if level else base
 
 
 # MCP Tool Registration
-@app.list_tools()
-async def handle_list_tools() -> list[Tool]:
-    """List available tools."""
-    return [
-        Tool(
-            name="list_datasets",
-            description="List all NHS datasets with descriptions, grain, publication source, and enrichment status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "schema": {"type": "string", "default": "staging"}
-                }
-            }
-        ),
-        Tool(
-            name="get_schema",
-            description="Get column metadata including original/semantic name mappings, descriptions, and whether columns were LLM-enriched",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {"type": "string"},
-                    "schema": {"type": "string", "default": "staging"}
+# The tool list never changes, so it is built once rather than on every tools/list
+_TOOLS = [
+    Tool(
+        name="list_datasets",
+        description="List all NHS datasets with descriptions, grain, publication source, and enrichment status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "schema": {"type": "string", "default": "staging"},
+                "exact": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Exact row counts (COUNT(*) on every table) instead of planner estimates",
                 },
-                "required": ["table_name"]
-            }
-        ),
-        Tool(
-            name="query",
-            description="Execute a SQL query against the NHS data",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "sql": {"type": "string"},
-                    "limit": {"type": "integer", "default": 1000}
+                "name_prefix": {
+                    "type": "string",
+                    "description": "Only tables whose name starts with this, e.g. tbl_adhd",
                 },
-                "required": ["sql"]
-            }
-        ),
-        Tool(
-            name="get_periods",
-            description="Get list of available time periods for a dataset",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {"type": "string"},
-                    "schema": {"type": "string", "default": "staging"}
+                "only_enriched": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Only tables with LLM-enriched column names",
                 },
-                "required": ["table_name"]
-            }
-        ),
-        Tool(
-            name="get_lineage",
-            description="Get complete data lineage: source pipeline, publication, file patterns, load history, and enrichment status",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "table_name": {"type": "string"}
+                "changed_since": {
+                    "type": "string",
+                    "description": "Only tables loaded at or after this ISO date/timestamp",
                 },
-                "required": ["table_name"]
             }
-        ),
-    ]
+        }
+    ),
+    Tool(
+        name="get_schema",
+        description="Get column metadata including original/semantic name mappings, descriptions, and whether columns were LLM-enriched",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {"type": "string"},
+                "schema": {"type": "string", "default": "staging"},
+                "compact": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": "Return columns as parallel lists (names, types, ...) with "
+                                   "'enriched' listing the positions of enriched columns",
+                },
+            },
+            "required": ["table_name"]
+        }
+    ),
+    Tool(
+        name="query",
+        description="Execute a SQL query against the NHS data",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "sql": {"type": "string"},
+                "limit": {"type": "integer", "default": 1000}
+            },
+            "required": ["sql"]
+        }
+    ),
+    Tool(
+        name="get_periods",
+        description="Get list of available time periods for a dataset",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {"type": "string"},
+                "schema": {"type": "string", "default": "staging"}
+            },
+            "required": ["table_name"]
+        }
+    ),
+    Tool(
+        name="get_lineage",
+        description="Get complete data lineage: source pipeline, publication, file patterns, load history, and enrichment status",
+        inputSchema={
+            "type": "object",
+            "properties": {
+                "table_name": {"type": "string"}
+            },
+            "required": ["table_name"]
+        }
+    ),
+    Tool(
+        name="clear_cache",
+        description="Forget cached dataset listings, periods, schemas and configs - use after loading new data",
+        inputSchema={"type": "object", "properties": {}}
+    ),
+]
+
+
+@app.list_tools()
+async def handle_list_tools() -> list[Tool]:
+    """List available tools."""
+    return _TOOLS
+
+
+def _call_tool(name: str, arguments: dict) -> str:
+    """Run a tool and serialize its result (blocking - DB access and JSON)."""
+    # No-op once pooled; retries if the database was down at startup
+    init_pool()
+    if name == "list_datasets":
+        result = list_datasets(
+            arguments.get('schema', 'staging'),
+            exact=bool(arguments.get('exact', False)),
+            name_prefix=arguments.get('name_prefix') or None,
+            only_enriched=bool(arguments.get('only_enriched', False)),
+            changed_since=arguments.get('changed_since') or None,
+        )
+    elif name == "get_schema":
+        result = get_schema(arguments['table_name'], arguments.get('schema', 'staging'),
+                            compact=bool(arguments.get('compact', False)))
+    elif name == "query":
+        result = query(arguments['sql'], arguments.get('limit', 1000))
+    elif name == "get_periods":
+        result = get_periods(arguments['table_name'], arguments.get('schema', 'staging'))
+    elif name == "get_lineage":
+        result = get_lineage(arguments['table_name'])
+    elif name == "clear_cache":
+        clear_cache()
+        result = {'cleared': True}
+    else:
+        result = {'error': f'Unknown tool: {name}'}
+    return _dumps(result)
 
 
 @app.call_tool()
@@ -428,23 +846,10 @@ async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
     logger.info(f"Tool called: {name} with args: {arguments}")
 
     try:
-        if name == "list_datasets":
-            result = list_datasets(arguments.get('schema', 'staging'))
-        elif name == "get_schema":
-            result = get_schema(arguments['table_name'], arguments.get('schema', 'staging'))
-        elif name == "query":
-            result = query(arguments['sql'], arguments.get('limit', 1000))
-        elif name == "get_periods":
-            result = get_periods(arguments['table_name'], arguments.get('schema', 'staging'))
-        elif name == "get_lineage":
-            result = get_lineage(arguments['table_name'])
-        else:
-            result = {'error': f'Unknown tool: {name}'}
-
-        return [TextContent(
-            type="text",
-            text=json.dumps(result, indent=2, default=str)
-        )]
+        # psycopg2 blocks - run in a worker thread so concurrent calls
+        # each get a pooled connection instead of queueing on the event loop
+        text = await asyncio.to_thread(_call_tool, name, arguments)
+        return [TextContent(type="text", text=text)]
 
     except Exception as e:
         logger.error(f"Error in tool {name}: {e}", exc_info=True)
@@ -458,20 +863,24 @@ async def main():
     """Main entry point for stdio server."""
     logger.info("DataWarp v3.1 MCP server starting...")
 
-    # Check database connection
+    # Check database connection, keeping connections open across tool calls
     try:
+        init_pool()
         datasets = list_datasets()
         logger.info(f"Database connected: {len(datasets)} tables available")
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
 
     # Run the stdio server
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        close_pool()
 
 
 def test_mode():
@@ -584,15 +993,23 @@ def test_mode():
 
 if __name__ == '__main__':
     import argparse
-    import asyncio
 
     parser = argparse.ArgumentParser(description='DataWarp MCP Server')
     parser.add_argument('--test', action='store_true', help='Run in test mode')
     parser.add_argument('--stdio', action='store_true', help='Run as MCP stdio server')
+    parser.add_argument('--refresh-snapshot', action='store_true',
+                        help='Save the dataset listing for fast server start-up (run after loads)')
     args = parser.parse_args()
 
-    if args.test:
-        test_mode()
+    if args.refresh_snapshot:
+        count = write_snapshot()
+        print(f"Saved {count} datasets to {SNAPSHOT_PATH}")
+    elif args.test:
+        init_pool()
+        try:
+            test_mode()
+        finally:
+            close_pool()
     elif args.stdio:
         asyncio.run(main())
     else:
@@ -25,6 +25,7 @@ CREATE TABLE IF NOT EXISTS datawarp.tbl_load_history (
     source_rows INT,           -- Row count in original file/sheet
     source_columns INT,        -- Column count in original file/sheet
     source_path TEXT,          -- Full path within archive (for ZIPs)
+    source_hash VARCHAR(64),   -- SHA-256 of the source file, to skip unchanged reloads
     loaded_at TIMESTAMP DEFAULT NOW(),
     UNIQUE(pipeline_id, period, table_name, sheet_name)
 );
@@ -36,6 +37,11 @@ ON datawarp.tbl_load_history(pipeline_id);
 CREATE INDEX IF NOT EXISTS idx_load_history_period
 ON datawarp.tbl_load_history(period);
 
+-- Lineage lookups by table, newest first (MCP get_lineage).
+-- Lookups by pipeline_id/period are served by the UNIQUE constraint's index.
+CREATE INDEX IF NOT EXISTS idx_load_history_table_loaded
+ON datawarp.tbl_load_history(table_name, loaded_at DESC);
+
 -- Enrichment API call logging for observability
 CREATE TABLE IF NOT EXISTS datawarp.tbl_enrichment_log (
     id SERIAL PRIMARY KEY,
@@ -123,6 +129,7 @@ ON datawarp.tbl_cli_runs(status);
 ALTER TABLE datawarp.tbl_load_history ADD COLUMN IF NOT EXISTS source_rows INT;
 ALTER TABLE datawarp.tbl_load_history ADD COLUMN IF NOT EXISTS source_columns INT;
 ALTER TABLE datawarp.tbl_load_history ADD COLUMN IF NOT EXISTS source_path TEXT;
+ALTER TABLE datawarp.tbl_load_history ADD COLUMN IF NOT EXISTS source_hash VARCHAR(64);
 
 -- ============================================================================
 -- METADATA VIEWS (for easy querying)
@@ -233,3 +240,22 @@ SELECT
 FROM datawarp.v_table_metadata tm
 FULL OUTER JOIN datawarp.v_table_stats ts
     ON tm.table_name = ts.table_name;
+
+-- ============================================================================
+-- DASHBOARD SUMMARY (materialized)
+-- ============================================================================
+-- Per-pipeline load summary for `list`. Refreshed at the end of scan/backfill
+-- so listing pipelines never aggregates tbl_load_history.
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS datawarp.mv_pipeline_status AS
+SELECT
+    pipeline_id,
+    COUNT(DISTINCT period) as period_count,
+    COUNT(DISTINCT table_name) as table_count,
+    MAX(loaded_at) as last_loaded_at
+FROM datawarp.tbl_load_history
+GROUP BY pipeline_id;
+
+-- Unique index lets REFRESH ... CONCURRENTLY run without blocking readers
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_pipeline_status_pipeline
+ON datawarp.mv_pipeline_status(pipeline_id);
@@ -2,7 +2,6 @@
 Add-sheet command - add a new sheet to an existing pipeline.
 """
 import os
-import re
 import tempfile
 from typing import Optional
 
@@ -80,7 +79,7 @@ def add_sheet_command(pipeline: str, sheet: str, file_pattern: Optional[int], en
 
     # Filter to matching files (match ANY pattern)
     matching = [f for f in files
-                if any(re.match(p, f.filename, re.IGNORECASE) for p in target_fp.filename_patterns)]
+                if target_fp.matches(f.filename)]
 
     if not matching:
         console.print(f"[error]No files matching patterns: {target_fp.filename_patterns}[/]")
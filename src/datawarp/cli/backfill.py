@@ -3,7 +3,6 @@ Backfill command for DataWarp CLI.
 
 Loads historical data for all (or a range of) periods that haven't been loaded yet.
 """
-import tempfile
 from typing import Optional
 
 import click
@@ -12,8 +11,9 @@ from rich.prompt import Confirm
 from datawarp.cli.console import console
 from datawarp.cli.helpers import group_files_by_period
 from datawarp.cli.file_processor import load_period_files
-from datawarp.discovery import scrape_landing_page
-from datawarp.pipeline import load_config, save_config
+from datawarp.discovery import scrape_landing_page, CACHE_DIR
+from datawarp.pipeline import load_config, save_config, refresh_pipeline_status
+from datawarp.storage import init_pool, close_pool
 from datawarp.tracking import track_run
 
 
@@ -28,8 +28,13 @@ def backfill_command(pipeline: str, from_period: Optional[str], to_period: Optio
 
     Loads all periods (or a range) that haven't been loaded yet.
     """
-    with track_run('backfill', {'pipeline': pipeline, 'from': from_period, 'to': to_period, 'force': force}, pipeline) as tracker:
-        _backfill_impl(pipeline, from_period, to_period, force, tracker)
+    # Reuse connections across the many small load/history statements
+    init_pool()
+    try:
+        with track_run('backfill', {'pipeline': pipeline, 'from': from_period, 'to': to_period, 'force': force}, pipeline) as tracker:
+            _backfill_impl(pipeline, from_period, to_period, force, tracker)
+    finally:
+        close_pool()
 
 
 def _backfill_impl(pipeline: str, from_period: Optional[str], to_period: Optional[str], force: bool, tracker: dict):
@@ -69,14 +74,17 @@ def _backfill_impl(pipeline: str, from_period: Optional[str], to_period: Optiona
         return
 
     # Load each period using shared file processor
-    temp_dir = tempfile.mkdtemp()
+    # Persistent per-pipeline download dir: re-runs only re-fetch files that changed
+    download_dir = CACHE_DIR / 'downloads' / config.pipeline_id
+    download_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir = str(download_dir)
     total_loaded = 0
 
     for period in sorted(to_load):
         console.print(f"\n[highlight]Loading period: {period}[/]")
 
         period_files = [item['file'] for item in by_period[period]]
-        results = load_period_files(config, period, period_files, temp_dir, console)
+        results = load_period_files(config, period, period_files, temp_dir, console, force=force)
 
         if results:
             period_rows = sum(rows for _, rows in results)
@@ -84,6 +92,8 @@ def _backfill_impl(pipeline: str, from_period: Optional[str], to_period: Optiona
             config.add_period(period)
             save_config(config)
 
+    refresh_pipeline_status()
+
     # Update tracker
     tracker['periods_loaded'] = list(to_load)
     tracker['periods_count'] = len(to_load)
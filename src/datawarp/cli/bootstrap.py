@@ -21,9 +21,9 @@ from datawarp.cli.schema_grouper import group_by_schema, pick_representative, ex
 from datawarp.cli.file_processor import process_data_file
 from datawarp.cli.sheet_selector import analyze_sheets, display_sheet_table, select_sheets
 from datawarp.discovery import scrape_landing_page, classify_url
-from datawarp.loader import download_file, get_sheet_names, load_sheet, load_file
+from datawarp.loader import download_file, get_sheet_names, load_dataframe, load_file, clear_workbook_cache
 from datawarp.metadata import detect_grain, enrich_sheet
-from datawarp.pipeline import PipelineConfig, FilePattern, SheetMapping, save_config, record_load, load_config
+from datawarp.pipeline import PipelineConfig, FilePattern, SheetMapping, save_config, record_load, load_config, refresh_pipeline_status
 from datawarp.tracking import track_run
 from datawarp.storage import get_connection
 from datawarp.utils import sanitize_name, make_table_name
@@ -206,7 +206,9 @@ def _load_sheets(selected: List[dict], local_path: str, period: str, auto_id: st
 
         console.print(f"  [muted]Table: staging.{table_name}[/]")
         with console.status("Loading to database..."):
-            rows, learned_mappings, col_types = load_sheet(local_path, sheet, table_name, period=period, column_mappings=col_mappings)
+            # Load the frame already extracted for analysis rather than re-reading the sheet
+            rows, learned_mappings, col_types = load_dataframe(df, table_name, period=period, column_mappings=col_mappings,
+                                                               extractor_types=sp['column_types'])
 
         if rows == 0:
             console.print("  [muted]Skipped (no data)[/]")
@@ -297,7 +299,7 @@ def _process_csv(local_path: str, f, period: str, auto_id: str, enrich: bool, fi
         console.print(f"  [warning]Name collision resolved: → {table_name}[/]")
 
     with console.status("Loading to database..."):
-        rows, learned_mappings, col_types = load_file(local_path, table_name, period=period, column_mappings=col_mappings)
+        rows, learned_mappings, col_types = load_dataframe(full_df, table_name, period=period, column_mappings=col_mappings)
 
     console.print(f"  [success]Loaded {rows} rows to staging.{table_name}[/]")
     record_load(auto_id, period, table_name, f.filename, None, rows,
@@ -317,6 +319,7 @@ def _save_pipeline(classification, auto_name: str, auto_id: str, file_patterns:
         file_context=file_context,  # Store extracted metadata context for MCP
     )
     save_config(config)
+    refresh_pipeline_status()
 
     # Collect all unique table names from this run
     all_tables = []
@@ -504,6 +507,8 @@ def _bootstrap_impl(url: str, name: Optional[str], pipeline_id: Optional[str], e
                             source_rows=source_rows, source_columns=source_columns, source_path=source_path)
         else:
             mappings = []
+        # Sheets of this file were all read from one cached parse - release it
+        clear_workbook_cache()
 
         if mappings:
             file_patterns.append(FilePattern(filename_patterns=[make_filename_pattern(f.filename)], file_types=[f.file_type], sheet_mappings=mappings))
@@ -6,7 +6,7 @@ and optional LLM enrichment.
 """
 import os
 import re
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from urllib.parse import unquote
 
 import pandas as pd
@@ -48,11 +48,13 @@ def _deduplicate_files(file_tuples: List[Tuple[str, str]]) -> List[Tuple[str, st
     return result
 
 from datawarp.loader import (
-    load_sheet, load_file, download_file, get_sheet_names,
-    extract_zip, list_zip_contents, FileExtractor,
+    load_sheet, load_file, load_dataframe, download_file, download_files, file_sha256, get_sheet_names,
+    extract_zip, list_zip_contents, FileExtractor, clear_workbook_cache,
 )
 from datawarp.metadata import detect_grain, enrich_sheet
-from datawarp.pipeline import SheetMapping, PipelineConfig, record_load, save_config
+from datawarp.pipeline import (
+    SheetMapping, PipelineConfig, LoadRecord, record_loads, save_config, get_source_hashes,
+)
 from datawarp.utils import sanitize_name, make_table_name
 from datawarp.cli.schema_grouper import get_fingerprint
 
@@ -102,9 +104,13 @@ def _enrich_and_load(
     is_csv: bool = False,
     name_registry=None,
     source_context: str = None,
+    extractor_types: Dict[str, str] = None,
 ) -> Tuple[SheetMapping, int, int, int]:
     """Common enrichment and loading logic for both CSV and Excel files.
 
+    df is loaded as-is, so the file isn't parsed a second time. For Excel
+    sheets pass the extractor's column types (TableStructure.get_column_types()).
+
     Returns: (SheetMapping, rows_loaded, source_rows, source_columns)
     """
     # Track source metrics for reconciliation
@@ -141,14 +147,9 @@ def _enrich_and_load(
         console.print(f"{'  ' if is_csv else '    '}[warning]Name collision resolved: → {table_name}[/]")
 
     # Load data
-    if is_csv:
-        rows, learned_mappings, col_types = load_file(
-            local_path, table_name, period=period, column_mappings=col_mappings
-        )
-    else:
-        rows, learned_mappings, col_types = load_sheet(
-            local_path, sheet_name, table_name, period=period, column_mappings=col_mappings
-        )
+    rows, learned_mappings, col_types = load_dataframe(
+        df, table_name, period=period, column_mappings=col_mappings, extractor_types=extractor_types
+    )
 
     if rows > 0:
         indent = "  " if is_csv else "    "
@@ -265,7 +266,8 @@ def process_data_file(
                 source_ctx = f"{zip_context}/{sheet}" if zip_context else f"{filename}/{sheet}"
                 result, rows, source_rows, source_columns = _enrich_and_load(
                     df, sheet, local_path, auto_id, period, enrich, console,
-                    name_registry=name_registry, source_context=source_ctx
+                    name_registry=name_registry, source_context=source_ctx,
+                    extractor_types=extractor.infer_structure().get_column_types(),
                 )
                 if result:
                     # Store source metrics with result for record_load
@@ -309,6 +311,7 @@ def process_data_file(
 
 def load_period_files(
     config: PipelineConfig, period: str, period_files: List, temp_dir: str, console,
+    force: bool = False,
 ) -> List[Tuple[str, int]]:
     """
     Load all files for a period using config patterns.
@@ -316,14 +319,21 @@ def load_period_files(
 
     Includes drift detection: if new columns are found, they're added with
     identity mappings and the config is saved with bumped version.
+
+    Sheets whose source file is byte-identical to the one last loaded for this
+    period are skipped unless force is set. They are not reloaded, but still
+    appear in the results with 0 rows so callers mark the period as loaded.
     """
     results = []
+    load_records = []
     config_modified = False
 
+    # Match every pattern first (may prompt), then fetch the period's files concurrently
+    plan = []
     for fp in config.file_patterns:
         # Match if ANY pattern matches
         matching = [f for f in period_files
-                    if any(re.match(p, f.filename, re.IGNORECASE) for p in fp.filename_patterns)]
+                    if fp.matches(f.filename)]
 
         if not matching:
             # Try to find files with compatible schema
@@ -342,47 +352,78 @@ def load_period_files(
                     config_modified = True
                     # Re-match with updated patterns (only match files fitting the new pattern)
                     matching = [f for f in period_files
-                                if any(re.match(p, f.filename, re.IGNORECASE) for p in fp.filename_patterns)]
+                                if fp.matches(f.filename)]
                 else:
                     continue
             else:
                 console.print(f"  [warning]No file matching patterns[/]")
                 continue
 
-        for f in matching:
-            console.print(f"  Processing: {unquote(f.filename)}")
+        plan.append((fp, matching))
 
-            with console.status("Downloading..."):
-                local_path = download_file(f.url, temp_dir)
+    urls = [f.url for _, matching in plan for f in matching]
+    with console.status(f"Downloading {len(set(urls))} file(s)..."):
+        downloaded = download_files(urls, temp_dir)
 
-            for sm in fp.sheet_mappings:
-                # Track version before loading (drift detection may bump it)
-                version_before = sm.mappings_version
+    previous_hashes = {} if force else get_source_hashes(config.pipeline_id, period)
 
-                with console.status(f"Loading {sm.sheet_pattern or 'data'}..."):
-                    if f.file_type == 'csv' or not sm.sheet_pattern:
-                        rows, _, _ = load_file(
-                            local_path, sm.table_name, period=period,
-                            column_mappings=sm.column_mappings,
-                            sheet_mapping=sm,  # Pass for drift detection
-                        )
-                    else:
-                        rows, _, _ = load_sheet(
-                            local_path, sm.sheet_pattern, sm.table_name,
-                            period=period, column_mappings=sm.column_mappings,
-                            sheet_mapping=sm,  # Pass for drift detection
-                        )
-
-                # Check if drift was detected (version bumped)
-                if sm.mappings_version > version_before:
-                    config_modified = True
+    try:
+        for fp, matching in plan:
+            for f in matching:
+                console.print(f"  Processing: {unquote(f.filename)}")
+
+                local_path = downloaded.get(f.url)
+                if local_path is None:
+                    with console.status("Downloading..."):
+                        local_path = download_file(f.url, temp_dir)
+                source_hash = file_sha256(local_path)
+
+                for sm in fp.sheet_mappings:
+                    # Only safe when this file alone feeds the table for the period -
+                    # each load replaces the period's rows
+                    if len(matching) == 1 and previous_hashes.get((sm.table_name, sm.sheet_pattern)) == source_hash:
+                        console.print(f"    [muted]{sm.table_name}: unchanged since last load[/]")
+                        results.append((sm.table_name, 0))
+                        continue
+
+                    # Track version before loading (drift detection may bump it)
+                    version_before = sm.mappings_version
+
+                    with console.status(f"Loading {sm.sheet_pattern or 'data'}..."):
+                        if f.file_type == 'csv' or not sm.sheet_pattern:
+                            rows, _, _ = load_file(
+                                local_path, sm.table_name, period=period,
+                                column_mappings=sm.column_mappings,
+                                sheet_mapping=sm,  # Pass for drift detection
+                            )
+                        else:
+                            rows, _, _ = load_sheet(
+                                local_path, sm.sheet_pattern, sm.table_name,
+                                period=period, column_mappings=sm.column_mappings,
+                                sheet_mapping=sm,  # Pass for drift detection
+                            )
 
-                if rows > 0:
-                    console.print(f"    [success]{sm.table_name}: {rows} rows[/]")
-                    record_load(config.pipeline_id, period, sm.table_name, f.filename, sm.sheet_pattern, rows)
-                    results.append((sm.table_name, rows))
-                else:
-                    console.print(f"    [muted]{sm.table_name}: skipped (sheet not found)[/]")
+                    # Check if drift was detected (version bumped)
+                    if sm.mappings_version > version_before:
+                        config_modified = True
+
+                    if rows > 0:
+                        console.print(f"    [success]{sm.table_name}: {rows} rows[/]")
+                        load_records.append(LoadRecord(config.pipeline_id, period, sm.table_name,
+                                                       f.filename, sm.sheet_pattern, rows,
+                                                       source_hash=source_hash))
+                        results.append((sm.table_name, rows))
+                    else:
+                        console.print(f"    [muted]{sm.table_name}: skipped (sheet not found)[/]")
+
+                # Every sheet of this file came from one cached parse - release it
+                clear_workbook_cache()
+    finally:
+        clear_workbook_cache()
+        # Load history for the whole period in one round-trip, including files
+        # loaded before any failure
+        if load_records:
+            record_loads(load_records)
 
     # Save config if drift was detected (new columns added)
     if config_modified:
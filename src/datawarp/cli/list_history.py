@@ -8,7 +8,7 @@ from rich.table import Table
 
 from datawarp.cli.console import console
 from datawarp.tracking import track_run
-from datawarp.pipeline import load_config, list_configs, get_load_history
+from datawarp.pipeline import load_config, list_configs, get_load_history, get_pipeline_status
 
 
 @click.command('list')
@@ -27,13 +27,19 @@ def list_command():
         table.add_column("ID", style="blue")
         table.add_column("Name", style="blue")
         table.add_column("Periods Loaded", justify="right", style="blue")
+        table.add_column("Tables", justify="right", style="blue")
+        table.add_column("Last Loaded", style="blue")
         table.add_column("Auto-load", style="blue")
 
+        status = get_pipeline_status()
         for c in configs:
+            s = status.get(c.pipeline_id, {})
             table.add_row(
                 c.pipeline_id,
                 c.name,
-                str(len(c.loaded_periods)),
+                str(s.get('period_count', 0)),
+                str(s.get('table_count', 0)),
+                s['last_loaded_at'].strftime('%Y-%m-%d %H:%M') if s.get('last_loaded_at') else '-',
                 "Yes" if c.auto_load else "No"
             )
 
@@ -12,7 +12,7 @@ from rich.prompt import Confirm
 from rich.table import Table
 
 from datawarp.cli.console import console
-from datawarp.pipeline import load_config, save_config
+from datawarp.pipeline import load_config, save_config, refresh_pipeline_status
 from datawarp.storage import get_connection
 
 
@@ -112,3 +112,5 @@ def reset_command(pipeline: str, yes: bool, delete: bool):
 
                 console.print(f"\n[success]Reset complete![/]")
                 console.print(f"\nTo reload data: [bold]python scripts/pipeline.py scan --pipeline {pipeline}[/]")
+
+    refresh_pipeline_status()
@@ -1,7 +1,6 @@
 """
 Scan command - find and load new periods for a pipeline.
 """
-import tempfile
 from datetime import datetime
 from typing import List
 
@@ -12,8 +11,9 @@ from dateutil.relativedelta import relativedelta
 from datawarp.cli.console import console
 from datawarp.cli.helpers import group_files_by_period
 from datawarp.cli.file_processor import load_period_files
-from datawarp.discovery import scrape_landing_page, generate_period_urls
-from datawarp.pipeline import load_config, save_config
+from datawarp.discovery import scrape_landing_page, generate_period_urls, CACHE_DIR
+from datawarp.pipeline import load_config, save_config, refresh_pipeline_status
+from datawarp.storage import init_pool, close_pool
 from datawarp.tracking import track_run
 
 
@@ -31,8 +31,13 @@ def scan_command(pipeline: str, dry_run: bool, force_scrape: bool):
     - discover: Scrape landing page for file links
     - explicit: URLs must be added manually
     """
-    with track_run('scan', {'pipeline': pipeline, 'dry_run': dry_run}, pipeline) as tracker:
-        _scan_impl(pipeline, dry_run, force_scrape, tracker)
+    # Reuse connections across the many small load/history statements
+    init_pool()
+    try:
+        with track_run('scan', {'pipeline': pipeline, 'dry_run': dry_run}, pipeline) as tracker:
+            _scan_impl(pipeline, dry_run, force_scrape, tracker)
+    finally:
+        close_pool()
 
 
 def _scan_impl(pipeline: str, dry_run: bool, force_scrape: bool, tracker: dict):
@@ -97,7 +102,10 @@ def _scan_impl(pipeline: str, dry_run: bool, force_scrape: bool, tracker: dict):
         return
 
     # Load each new period
-    temp_dir = tempfile.mkdtemp()
+    # Persistent per-pipeline download dir: re-runs only re-fetch files that changed
+    download_dir = CACHE_DIR / 'downloads' / config.pipeline_id
+    download_dir.mkdir(parents=True, exist_ok=True)
+    temp_dir = str(download_dir)
 
     for period in sorted(new_periods):
         console.print(f"\n[highlight]Loading period: {period}[/]")
@@ -112,6 +120,8 @@ def _scan_impl(pipeline: str, dry_run: bool, force_scrape: bool, tracker: dict):
             config.add_period(period)
             save_config(config)
 
+    refresh_pipeline_status()
+
     # Update tracker
     tracker['periods_loaded'] = list(new_periods)
     tracker['periods_count'] = len(new_periods)
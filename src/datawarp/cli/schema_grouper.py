@@ -8,6 +8,8 @@ from collections import defaultdict
 from typing import Dict, List, Tuple
 import pandas as pd
 
+from datawarp.loader import read_excel
+
 
 def get_fingerprint(path: str) -> tuple:
     """Extract column names as schema fingerprint."""
@@ -15,7 +17,7 @@ def get_fingerprint(path: str) -> tuple:
         if path.endswith('.csv'):
             cols = pd.read_csv(path, nrows=0).columns.tolist()
         else:
-            cols = pd.read_excel(path, nrows=0).columns.tolist()
+            cols = read_excel(path, nrows=0).columns.tolist()
         # Normalize: lowercase, strip, ignore unnamed columns
         return tuple(
             c.lower().strip() for c in cols
@@ -84,7 +86,6 @@ def find_compatible_files(fp, period_files, temp_dir, already_matched=None):
 
     Returns list of (file, local_path) tuples for compatible unmatched files.
     """
-    import re
     from datawarp.loader import download_file
 
     already_matched = already_matched or []
@@ -98,7 +99,7 @@ def find_compatible_files(fp, period_files, temp_dir, already_matched=None):
         if f in already_matched or f.file_type not in fp.file_types:
             continue
         # Skip if matches any existing pattern
-        if any(re.match(p, f.filename, re.IGNORECASE) for p in fp.filename_patterns):
+        if fp.matches(f.filename):
             continue
 
         # Download and check schema
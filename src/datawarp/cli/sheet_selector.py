@@ -48,7 +48,7 @@ def analyze_sheets(local_path: str, sheets: List[str]) -> List[dict]:
                     'name': sheet, 'grain': grain_info['grain'],
                     'rows': len(df), 'cols': len(df.columns),
                     'description': grain_info['description'] or infer_sheet_description(sheet),
-                    'df': df, 'grain_info': grain_info,
+                    'df': df, 'grain_info': grain_info, 'column_types': structure.get_column_types(),
                 })
             except Exception as e:
                 previews.append({
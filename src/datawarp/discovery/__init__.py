@@ -1,5 +1,5 @@
 """URL discovery and scraping"""
-from .scraper import scrape_landing_page, DiscoveredFile
+from .scraper import scrape_landing_page, DiscoveredFile, CACHE_DIR
 from .classifier import (
     classify_url,
     URLClassification,
@@ -1,6 +1,11 @@
 """Scrape NHS landing pages for data files"""
+import hashlib
+import json
+import os
 import re
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from typing import List, Optional, Set
 from urllib.parse import urljoin, urlparse, unquote
 
@@ -23,6 +28,13 @@ class DiscoveredFile:
 # File extensions we care about
 DATA_EXTENSIONS = {'.xlsx', '.xls', '.csv', '.zip'}
 
+# Period sub-page scrape results are cached on disk with the page's ETag/Last-Modified
+# and revalidated with a conditional GET, so an unchanged page (304) isn't re-parsed
+# while a revised one (e.g. provisional -> final) is. The landing page is always
+# fetched fresh. A TTL > 0 opts in to serving entries younger than it without asking.
+CACHE_DIR = Path(os.getenv('DATAWARP_CACHE_DIR', Path.home() / '.cache' / 'datawarp')).expanduser()
+SUBPAGE_CACHE_TTL = int(os.getenv('DATAWARP_SUBPAGE_CACHE_TTL', '0'))  # seconds, 0 always revalidates
+
 
 def scrape_landing_page(url: str, follow_links: bool = True) -> List[DiscoveredFile]:
     """
@@ -59,8 +71,7 @@ def scrape_landing_page(url: str, follow_links: bool = True) -> List[DiscoveredF
                 # Extract period from the sub-page URL (e.g., /december-2025/)
                 # Files on this page inherit this period if they don't have their own
                 page_period = extract_period_from_url(link)
-                sub_files, _ = _scrape_page(link, inherit_period=page_period)
-                files.extend(sub_files)
+                files.extend(_scrape_subpage(link, inherit_period=page_period))
 
     # Dedupe by URL
     seen_urls = set()
@@ -73,6 +84,70 @@ def scrape_landing_page(url: str, follow_links: bool = True) -> List[DiscoveredF
     return unique_files
 
 
+def _scrape_subpage(url: str, inherit_period: Optional[str] = None) -> List[DiscoveredFile]:
+    """Files on a period sub-page, from the disk cache if the page hasn't changed."""
+    key = hashlib.sha1(f"{url}|{inherit_period}".encode()).hexdigest()
+    cache_file = CACHE_DIR / 'subpages' / f"{key}.json"
+    try:
+        entry = json.loads(cache_file.read_text())
+        cached = [DiscoveredFile(**f) for f in entry['files']]
+        if SUBPAGE_CACHE_TTL > 0 and time.time() - cache_file.stat().st_mtime < SUBPAGE_CACHE_TTL:
+            return cached
+    except (OSError, ValueError, TypeError, KeyError):
+        entry, cached = {}, None  # Missing or unreadable cache entry - scrape it
+
+    headers = {}
+    if cached is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+
+    response = _get_page(url, headers)
+    if response is None:  # Never cache a failed fetch
+        return []
+    if response.status_code == 304 and headers:
+        try:
+            cache_file.touch()  # Restart the opt-in TTL
+        except OSError:
+            pass
+        return cached
+
+    files, _ = _parse_page(response.content, url, inherit_period)
+    entry = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'files': [asdict(f) for f in files],
+    }
+    try:
+        if entry['etag'] or entry['last_modified'] or SUBPAGE_CACHE_TTL > 0:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            cache_file.write_text(json.dumps(entry))
+        elif cached is not None:
+            cache_file.unlink()  # Nothing to revalidate against any more
+    except OSError:
+        pass  # Caching is best-effort
+    return files
+
+
+def _get_page(url: str, headers: Optional[dict] = None) -> Optional[requests.Response]:
+    """GET a page (200, or 304 for a conditional request), or None if the request failed."""
+    try:
+        response = requests.get(url, headers=headers or {}, timeout=30)
+        if response.status_code != 304:
+            response.raise_for_status()
+    except requests.RequestException as e:
+        print(f"Failed to fetch {url}: {e}")
+        return None
+    return response
+
+
+def _fetch_page(url: str) -> Optional[bytes]:
+    """Fetch page HTML, or None if the request failed."""
+    response = _get_page(url)
+    return response.content if response is not None else None
+
+
 def _scrape_page(url: str, inherit_period: Optional[str] = None) -> tuple[List[DiscoveredFile], List[str]]:
     """
     Scrape a single page for files and sub-links.
@@ -85,17 +160,19 @@ def _scrape_page(url: str, inherit_period: Optional[str] = None) -> tuple[List[D
     Returns:
         Tuple of (discovered files, sub-page links to follow)
     """
+    content = _fetch_page(url)
+    if content is None:
+        return [], []
+    return _parse_page(content, url, inherit_period)
+
+
+def _parse_page(content: bytes, url: str,
+                inherit_period: Optional[str] = None) -> tuple[List[DiscoveredFile], List[str]]:
+    """Extract data files and sub-page links from fetched page HTML."""
     files = []
     sub_links = []
 
-    try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Failed to fetch {url}: {e}")
-        return files, sub_links
-
-    soup = BeautifulSoup(response.content, 'html.parser')
+    soup = BeautifulSoup(content, 'html.parser')
     base_url = url
 
     # Find all links
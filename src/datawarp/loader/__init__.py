@@ -4,8 +4,11 @@ from .excel import (
     load_file,
     load_dataframe,
     download_file,
+    download_files,
+    file_sha256,
     get_sheet_names,
     preview_sheet,
+    read_excel,
     clear_workbook_cache,
     extract_zip,
     list_zip_contents,
@@ -1,9 +1,12 @@
 """Load Excel/CSV/ZIP files to PostgreSQL with the critical column fix"""
+import hashlib
+import json
 import os
 import tempfile
+import threading
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from io import StringIO
 from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 import pandas as pd
@@ -19,11 +22,30 @@ if TYPE_CHECKING:
 
 console = Console()
 
+# Rows serialized per chunk when streaming a DataFrame into COPY
+COPY_CHUNK_ROWS = 50000
+
+# Concurrent downloads when fetching all files for a period
+DOWNLOAD_WORKERS = 4
+
+# Create new staging tables UNLOGGED: COPY skips the WAL, but Postgres empties
+# the tables after a crash. Only for databases that can be reloaded with backfill.
+UNLOGGED_STAGING = os.getenv('DATAWARP_UNLOGGED_STAGING', '').lower() in ('1', 'true', 'yes')
+
+# Columns of tables this process has already created or extended:
+# {(schema, table): {column, ...}}. Loads whose columns are all known skip the
+# CREATE/information_schema/ALTER round-trips (e.g. each period of a backfill).
+_table_columns: Dict[Tuple[str, str], set] = {}
+
 
 def download_file(url: str, target_dir: Optional[str] = None) -> str:
     """
     Download a file from URL to local path.
 
+    The server's ETag/Last-Modified are kept in a sidecar ({path}.meta.json).
+    If the same URL was downloaded to target_dir before, the request is
+    conditional and an unchanged file (304) is not transferred again.
+
     Returns the local file path.
     """
     if target_dir is None:
@@ -31,16 +53,85 @@ def download_file(url: str, target_dir: Optional[str] = None) -> str:
 
     filename = url.split('/')[-1].split('?')[0]
     local_path = os.path.join(target_dir, filename)
+    meta_path = f"{local_path}.meta.json"
+
+    headers = {}
+    meta = _read_download_meta(meta_path)
+    if meta.get('url') == url and os.path.exists(local_path):
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+    with requests.get(url, headers=headers, timeout=60, stream=True) as response:
+        if response.status_code == 304 and headers:
+            return local_path
+        response.raise_for_status()
+
+        # Stream to a temporary name so a failed download never leaves a truncated file
+        part_path = f"{local_path}.part"
+        with open(part_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+        os.replace(part_path, local_path)
+
+        meta = {
+            'url': url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
 
-    response = requests.get(url, timeout=60)
-    response.raise_for_status()
-
-    with open(local_path, 'wb') as f:
-        f.write(response.content)
+    if meta['etag'] or meta['last_modified']:
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f)
+    elif os.path.exists(meta_path):
+        os.remove(meta_path)
 
     return local_path
 
 
+def _read_download_meta(meta_path: str) -> dict:
+    """Validators saved by a previous download_file(), or {} if none/unreadable."""
+    try:
+        with open(meta_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def download_files(urls: List[str], target_dir: str, max_workers: int = DOWNLOAD_WORKERS) -> Dict[str, str]:
+    """
+    Download several files concurrently.
+
+    Returns {url: local_path} for the downloads that succeeded. URLs whose
+    filenames collide are skipped so one download can't overwrite another;
+    callers fetch those (and retry failures) with download_file() when needed.
+    """
+    by_name: Dict[str, List[str]] = {}
+    for url in dict.fromkeys(urls):
+        by_name.setdefault(url.split('/')[-1].split('?')[0], []).append(url)
+    unique = [group[0] for group in by_name.values() if len(group) == 1]
+
+    paths = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(download_file, url, target_dir): url for url in unique}
+        for future in as_completed(futures):
+            try:
+                paths[futures[future]] = future.result()
+            except Exception:
+                pass  # Left for the caller's download_file() to retry and report
+    return paths
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 hex digest of a file, read in 1 MB chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
 def extract_zip(zip_path: str, target_dir: Optional[str] = None) -> List[Tuple[str, str]]:
     """
     Extract a zip file and return paths to data files inside.
@@ -230,10 +321,7 @@ def load_sheet(
             return 0, {}, {}
 
         # Get column types from extractor
-        structure = extractor.infer_structure()
-        extractor_types = {}
-        for col_info in structure.columns.values():
-            extractor_types[col_info.pg_name] = col_info.inferred_type
+        extractor_types = extractor.infer_structure().get_column_types()
 
         return load_dataframe(df, table_name, schema, period, column_mappings, extractor_types, sheet_mapping)
 
@@ -321,6 +409,8 @@ def load_dataframe(
     # This is the SINGLE SOURCE OF TRUTH
     # =========================================================
     final_columns = {}
+    seen = {}
+    new_cols = []
     for orig_col in df.columns:
         # Sanitize the original column name
         sanitized = sanitize_name(str(orig_col))
@@ -328,19 +418,15 @@ def load_dataframe(
         canonical = column_mappings.get(sanitized, sanitized)
         final_columns[orig_col] = canonical
 
-    # Apply to DataFrame - THIS IS NOW THE TRUTH
-    df = df.rename(columns=final_columns)
-
-    # Handle duplicate column names (add suffix)
-    seen = {}
-    new_cols = []
-    for col in df.columns:
-        if col in seen:
-            seen[col] += 1
-            new_cols.append(f"{col}_{seen[col]}")
+        # Handle duplicate column names (add suffix)
+        if canonical in seen:
+            seen[canonical] += 1
+            new_cols.append(f"{canonical}_{seen[canonical]}")
         else:
-            seen[col] = 0
-            new_cols.append(col)
+            seen[canonical] = 0
+            new_cols.append(canonical)
+
+    # Apply to DataFrame in one relabel - THIS IS NOW THE TRUTH
     df.columns = new_cols
 
     # Add period column if provided
@@ -370,7 +456,7 @@ def load_dataframe(
     full_table = f'{schema}.{table_name}'
 
     ddl = f"""
-        CREATE TABLE IF NOT EXISTS {full_table} (
+        CREATE {'UNLOGGED ' if UNLOGGED_STAGING else ''}TABLE IF NOT EXISTS {full_table} (
             {', '.join(col_defs)}
         )
     """
@@ -379,55 +465,75 @@ def load_dataframe(
     # STEP 4: COPY data using df.columns
     # CANNOT DRIFT - same column list as DDL
     # =========================================================
-    with get_connection() as conn:
-        with conn.cursor() as cur:
-            # Create table (if new)
-            cur.execute(ddl)
-
-            # Handle schema evolution: add missing columns
-            cur.execute("""
-                SELECT column_name FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s
-            """, (schema, table_name))
-            existing_cols = {row[0] for row in cur.fetchall()}
-
-            for col in df.columns:
-                if col not in existing_cols:
-                    pg_type = column_types.get(col, 'TEXT')
-                    cur.execute(f'ALTER TABLE {full_table} ADD COLUMN "{col}" {pg_type}')
-
-            # =========================================================
-            # SMART REPLACE: Delete existing data for this period
-            # If period is provided and table has period column, replace not append
-            # =========================================================
-            if period and 'period' in existing_cols:
-                cur.execute(f'DELETE FROM {full_table} WHERE period = %s', (period,))
-                # Silently replace - caller controls output
-
-            # Prepare data for COPY
-            # Fix: Convert empty strings to NaN for numeric columns
-            # PostgreSQL COPY cannot convert "" to numeric types
-            numeric_type_prefixes = ('NUMERIC', 'DOUBLE', 'INTEGER', 'SMALLINT', 'BIGINT', 'REAL')
-            for col in df.columns:
-                pg_type = column_types.get(col, 'TEXT').upper()
-                if pg_type.startswith(numeric_type_prefixes):
-                    # Replace empty strings with NaN so they become \N in CSV
-                    df[col] = df[col].replace('', pd.NA)
-
-            buffer = StringIO()
-            df.to_csv(buffer, index=False, header=False, sep='\t', na_rep='\\N')
-            buffer.seek(0)
-
-            # Build column list from df.columns (SAME as DDL)
-            columns_quoted = ', '.join(f'"{c}"' for c in df.columns)
-
-            # COPY data
-            cur.copy_expert(
-                f"COPY {full_table} ({columns_quoted}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N')",
-                buffer
-            )
-
-            rows_loaded = len(df)
+    table_key = (schema, table_name)
+    known_cols = _table_columns.get(table_key)
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                if known_cols is not None and known_cols.issuperset(df.columns):
+                    # Loaded this shape before - table and columns already exist
+                    existing_cols = known_cols
+                else:
+                    # Create table (if new)
+                    cur.execute(ddl)
+
+                    # Handle schema evolution: add missing columns
+                    cur.execute("""
+                        SELECT column_name FROM information_schema.columns
+                        WHERE table_schema = %s AND table_name = %s
+                    """, (schema, table_name))
+                    existing_cols = {row[0] for row in cur.fetchall()}
+
+                    # All new columns in one ALTER rather than one statement each.
+                    # IF NOT EXISTS: another loader may add the same column between probe and ALTER
+                    add_clauses = [
+                        f'ADD COLUMN IF NOT EXISTS "{col}" {column_types.get(col, "TEXT")}'
+                        for col in df.columns if col not in existing_cols
+                    ]
+                    if add_clauses:
+                        cur.execute(f'ALTER TABLE {full_table} {", ".join(add_clauses)}')
+                    known_cols = existing_cols | set(df.columns)
+
+                # =========================================================
+                # SMART REPLACE: Delete existing data for this period
+                # If period is provided and table has period column, replace not append
+                # =========================================================
+                if period and 'period' in existing_cols:
+                    cur.execute(f'DELETE FROM {full_table} WHERE period = %s', (period,))
+                    # Silently replace - caller controls output
+
+                # Prepare data for COPY
+                # Fix: Convert empty strings to NaN for numeric columns
+                # PostgreSQL COPY cannot convert "" to numeric types
+                # Only object/string columns can hold "" - numeric dtypes are skipped
+                # rather than copied through a no-op replace
+                numeric_type_prefixes = ('NUMERIC', 'DOUBLE', 'INTEGER', 'SMALLINT', 'BIGINT', 'REAL')
+                for col in df.columns:
+                    pg_type = column_types.get(col, 'TEXT').upper()
+                    if pg_type.startswith(numeric_type_prefixes) and df[col].dtype.kind not in 'biufmM':
+                        # Replace empty strings with NaN so they become \N in CSV
+                        df[col] = df[col].replace('', pd.NA)
+
+                # Build column list from df.columns (SAME as DDL)
+                columns_quoted = ', '.join(f'"{c}"' for c in df.columns)
+
+                # COPY data
+                _copy_dataframe(
+                    cur, df,
+                    f"COPY {full_table} ({columns_quoted}) FROM STDIN "
+                    f"WITH (FORMAT csv, DELIMITER E'\\t', NULL '\\N', ENCODING 'UTF8')"
+                )
+
+                rows_loaded = len(df)
+
+                # Refresh planner stats so row estimates (e.g. MCP list_datasets) reflect this load
+                cur.execute(f'ANALYZE {full_table}')
+    except Exception:
+        # Table may have been dropped or altered elsewhere - rediscover next time
+        _table_columns.pop(table_key, None)
+        raise
+    # Only remember the schema once the DDL has committed
+    _table_columns[table_key] = known_cols
 
     # Return the mappings we learned (sanitized -> canonical)
     learned_mappings = {sanitize_name(str(k)): v for k, v in final_columns.items()}
@@ -435,6 +541,38 @@ def load_dataframe(
     return rows_loaded, learned_mappings, column_types
 
 
+def _copy_dataframe(cur, df: pd.DataFrame, copy_sql: str) -> None:
+    """
+    Stream a DataFrame into COPY through a pipe.
+
+    A writer thread serializes the CSV in chunks while Postgres reads the other
+    end, so the whole file is never held in memory.
+    """
+    read_fd, write_fd = os.pipe()
+    errors = []
+
+    def write_csv():
+        try:
+            with os.fdopen(write_fd, 'w', encoding='utf-8', newline='') as writer:
+                df.to_csv(writer, index=False, header=False, sep='\t', na_rep='\\N',
+                          chunksize=COPY_CHUNK_ROWS)
+        except Exception as e:
+            errors.append(e)
+
+    writer_thread = threading.Thread(target=write_csv, daemon=True)
+    writer_thread.start()
+    try:
+        # Closing the read end on failure unblocks the writer (broken pipe)
+        with os.fdopen(read_fd, 'rb') as reader:
+            cur.copy_expert(copy_sql, reader)
+    finally:
+        writer_thread.join()
+
+    # A writer failure closes the pipe early - COPY would see a truncated file
+    if errors:
+        raise errors[0]
+
+
 def _infer_pg_type(series: pd.Series) -> str:
     """
     Infer PostgreSQL type from pandas Series.
@@ -489,6 +627,23 @@ def _infer_pg_type(series: pd.Series) -> str:
     return 'TEXT'
 
 
+def read_excel(file_path: str, **kwargs) -> pd.DataFrame:
+    """
+    pd.read_excel via the Rust calamine engine when python-calamine is installed.
+
+    Falls back to pandas' default engine if calamine is missing or can't read the file.
+    """
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return pd.read_excel(file_path, **kwargs)
+
+    try:
+        return pd.read_excel(file_path, engine='calamine', **kwargs)
+    except Exception:
+        return pd.read_excel(file_path, **kwargs)
+
+
 def preview_sheet(file_path: str, sheet_name: str, nrows: int = 5) -> pd.DataFrame:
     """Preview first N rows of a sheet using FileExtractor."""
     try:
@@ -497,17 +652,20 @@ def preview_sheet(file_path: str, sheet_name: str, nrows: int = 5) -> pd.DataFra
         return df.head(nrows)
     except Exception:
         # Fallback to simple pandas read
-        return pd.read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
+        return read_excel(file_path, sheet_name=sheet_name, nrows=nrows)
 
 
 # Re-export from extractor
 __all__ = [
     'download_file',
+    'download_files',
+    'file_sha256',
     'load_file',
     'load_sheet',
     'load_dataframe',
     'detect_column_drift',
     'preview_sheet',
+    'read_excel',
     'get_sheet_names',
     'clear_workbook_cache',
 ]
@@ -14,6 +14,8 @@ import openpyxl
 from openpyxl.utils import get_column_letter
 import re
 import logging
+import zipfile
+from xml.etree import ElementTree
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
 from enum import Enum, auto
@@ -24,6 +26,9 @@ logger = logging.getLogger(__name__)
 # Workbook cache: filepath → openpyxl.Workbook
 _workbook_cache: Dict[str, Any] = {}
 
+# Footnote markers and thousands separators ignored when spotting repeated header rows
+_SUPERSCRIPT_RE = re.compile(r'[¹²³⁴⁵⁶⁷⁸⁹⁰,]+')
+
 
 def clear_workbook_cache():
     """Clear the workbook cache. Call at end of batch processing."""
@@ -87,6 +92,10 @@ class TableStructure:
     def get_column_names(self) -> List[str]:
         return [self.columns[idx].pg_name for idx in sorted(self.columns.keys())]
 
+    def get_column_types(self) -> Dict[str, str]:
+        """PostgreSQL type per output column, for load_dataframe(extractor_types=...)."""
+        return {col.pg_name: col.inferred_type for col in self.columns.values()}
+
 
 class FileExtractor:
     """
@@ -135,14 +144,15 @@ class FileExtractor:
                 for col in range(mr.min_col, mr.max_col + 1):
                     self._merged_map[(row, col)] = (mr.min_row, mr.min_col, val_str)
 
+    def _row_values(self, row: int, max_col: int) -> Tuple[Any, ...]:
+        """Values of columns 1..max_col in one row."""
+        return next(self.ws.iter_rows(min_row=row, max_row=row, max_col=max_col, values_only=True))
+
     def _cache_rows(self, rows: List[int], max_col: int):
         """Pre-cache multiple rows in row-major order."""
         for row in rows:
             if row not in self._row_cache:
-                self._row_cache[row] = [
-                    self.ws.cell(row=row, column=col).value
-                    for col in range(1, max_col + 1)
-                ]
+                self._row_cache[row] = self._row_values(row, max_col)
 
     def _get_cached_value(self, row: int, col: int) -> Any:
         """Get value from cache (col is 1-indexed)."""
@@ -237,9 +247,9 @@ class FileExtractor:
 
         # Analyze first 30 rows for density and structure
         empty, single, multi, total_cells = 0, 0, 0, 0
-        for row in range(1, min(31, self.ws.max_row + 1)):
-            cells = sum(1 for col in range(1, min(20, self.ws.max_column + 1))
-                        if self.ws.cell(row=row, column=col).value is not None)
+        for values in self.ws.iter_rows(min_row=1, max_row=min(30, self.ws.max_row),
+                                        max_col=min(19, self.ws.max_column), values_only=True):
+            cells = sum(1 for v in values if v is not None)
             total_cells += cells
             if cells == 0:
                 empty += 1
@@ -362,9 +372,9 @@ class FileExtractor:
         rows_to_check = list(header_rows) + list(range(data_start_row, min(data_start_row + 5, self.ws.max_row + 1)))
 
         for row in rows_to_check:
-            for col in range(min(self.ws.max_column, 500), 0, -1):
-                val = self.ws.cell(row=row, column=col).value
-                if val is not None:
+            values = self._row_values(row, min(self.ws.max_column, 500))
+            for col in range(len(values), 0, -1):
+                if values[col - 1] is not None:
                     max_col = max(max_col, col)
                     break
 
@@ -446,37 +456,48 @@ class FileExtractor:
         data_end_row: int
     ):
         """Infer column types using Excel cell metadata."""
-        for col_idx, col_info in columns.items():
-            cell_types_seen = set()
-            sample_values = []
-            has_decimal_values = False
-
-            for r in range(data_start_row, data_end_row + 1):
-                cell = self.ws.cell(row=r, column=col_idx)
+        if not columns:
+            return
+
+        # One row-major pass over the data block, tracking each column as we go
+        col_indices = sorted(columns)
+        min_col, max_col = col_indices[0], col_indices[-1]
+        cell_types_seen = {col_idx: set() for col_idx in col_indices}
+        sample_values = {col_idx: [] for col_idx in col_indices}
+        has_decimal_values = set()
+        sample_end_row = data_start_row + 100
+
+        rows = self.ws.iter_rows(min_row=data_start_row, max_row=data_end_row,
+                                 min_col=min_col, max_col=max_col)
+        for r, row in enumerate(rows, start=data_start_row):
+            for col_idx in col_indices:
+                cell = row[col_idx - min_col]
                 val = cell.value
 
                 if val is not None:
                     if cell.data_type:
-                        cell_types_seen.add(cell.data_type)
+                        cell_types_seen[col_idx].add(cell.data_type)
 
                         if cell.data_type == 'n' and isinstance(val, (int, float)):
                             if val % 1 != 0:
-                                has_decimal_values = True
+                                has_decimal_values.add(col_idx)
                     else:
                         if isinstance(val, str):
-                            cell_types_seen.add('s')
+                            cell_types_seen[col_idx].add('s')
 
-                if r < data_start_row + 100:
-                    sample_values.append(val)
+                if r < sample_end_row:
+                    sample_values[col_idx].append(val)
 
-            col_info.sample_values = sample_values
+        for col_idx, col_info in columns.items():
+            col_info.sample_values = sample_values[col_idx]
 
-            has_numeric = 'n' in cell_types_seen or 'd' in cell_types_seen
-            has_text = 's' in cell_types_seen
+            types_seen = cell_types_seen[col_idx]
+            has_numeric = 'n' in types_seen or 'd' in types_seen
+            has_text = 's' in types_seen
 
             if has_numeric and has_text:
                 col_info.inferred_type = 'VARCHAR(255)'
-            elif has_numeric and has_decimal_values:
+            elif has_numeric and col_idx in has_decimal_values:
                 col_info.inferred_type = 'DOUBLE PRECISION'
             else:
                 col_info.inferred_type = self._infer_type_from_values(
@@ -596,8 +617,7 @@ class FileExtractor:
         """Check if row contains actual data."""
         numeric_count = 0
         total = 0
-        for col in range(1, min(20, self.ws.max_column + 1)):
-            val = self.ws.cell(row=row_num, column=col).value
+        for val in self._row_values(row_num, min(19, self.ws.max_column)):
             if val is not None:
                 total += 1
                 s = str(val).strip()
@@ -646,34 +666,49 @@ class FileExtractor:
 
     def _count_cells(self, row_num: int) -> int:
         """Count non-empty cells in a row."""
-        return sum(
-            1 for col in range(1, min(50, self.ws.max_column + 1))
-            if self.ws.cell(row=row_num, column=col).value is not None
-        )
+        return sum(1 for v in self._row_values(row_num, min(49, self.ws.max_column)) if v is not None)
 
     def extract_data(self) -> List[Dict[str, Any]]:
         """Extract data as list of dictionaries."""
+        names, rows = self._extract_rows()
+        return [dict(zip(names, row)) for row in rows]
+
+    def _extract_rows(self) -> Tuple[List[str], List[List[Any]]]:
+        """Extract data as (column names, row value lists) - no per-row dicts."""
         structure = self.infer_structure()
 
         if not structure.is_valid:
-            return []
+            return [], []
 
         rows = []
         first_header_row = structure.header_rows[0] if structure.header_rows else None
 
-        for row_num in range(structure.data_start_row, structure.data_end_row + 1):
-            has_content = any(
-                self.ws.cell(row=row_num, column=col).value is not None
-                for col in list(structure.columns.keys())[:5]
-            )
+        col_indices = list(structure.columns.keys())
+        content_cols = [c - 1 for c in col_indices[:5]]
+        max_col = max(col_indices)
+        value_names = [(col_idx - 1, col_info.pg_name) for col_idx, col_info in structure.columns.items()]
+        value_idx = [i for i, _ in value_names]
+
+        # Cleaned header text for the first 3 columns, to spot repeated header rows
+        header_clean = []
+        if first_header_row:
+            header_values = self._row_values(first_header_row, max_col)
+            for col_idx in col_indices[:3]:
+                header_val = str(header_values[col_idx - 1] or '').strip().lower()
+                header_clean.append((col_idx - 1, _SUPERSCRIPT_RE.sub('', header_val)))
+
+        # Single row-major pass; each row's values are read once
+        for values in self.ws.iter_rows(min_row=structure.data_start_row, max_row=structure.data_end_row,
+                                        max_col=max_col, values_only=True):
+            has_content = any(values[i] is not None for i in content_cols)
 
             if not has_content:
                 continue
 
             # Check for footer
             is_footer = False
-            for col_idx in list(structure.columns.keys())[:5]:
-                val = self.ws.cell(row=row_num, column=col_idx).value
+            for i in content_cols:
+                val = values[i]
                 if val:
                     val_str = str(val).strip().lower()
                     if any(val_str.startswith(sw) for sw in self.STOP_WORDS):
@@ -687,40 +722,53 @@ class FileExtractor:
                 break
 
             # Skip duplicate header rows (section separators)
-            if first_header_row:
+            if header_clean:
                 matches = 0
-                for col_idx in list(structure.columns.keys())[:3]:
-                    current_val = str(self.ws.cell(row=row_num, column=col_idx).value or '').strip().lower()
-                    header_val = str(self.ws.cell(row=first_header_row, column=col_idx).value or '').strip().lower()
-                    current_clean = re.sub(r'[¹²³⁴⁵⁶⁷⁸⁹⁰,]+', '', current_val)
-                    header_clean = re.sub(r'[¹²³⁴⁵⁶⁷⁸⁹⁰,]+', '', header_val)
-                    if current_clean and header_clean and current_clean == header_clean:
+                for i, header_val in header_clean:
+                    current_val = str(values[i] or '').strip().lower()
+                    current_clean = _SUPERSCRIPT_RE.sub('', current_val)
+                    if current_clean and header_val and current_clean == header_val:
                         matches += 1
                 if matches >= 2:
                     continue
 
-            row_data = {}
-            for col_idx, col_info in structure.columns.items():
-                cell_val = self.ws.cell(row=row_num, column=col_idx).value
+            row_data = []
+            for i in value_idx:
+                cell_val = values[i]
                 if cell_val is not None:
                     if str(cell_val).strip().lower() in self.SUPPRESSED_VALUES:
                         cell_val = None
-                row_data[col_info.pg_name] = cell_val
+                row_data.append(cell_val)
 
             rows.append(row_data)
 
-        return rows
+        return [name for _, name in value_names], rows
 
     def to_dataframe(self):
         """Convert extracted data to pandas DataFrame."""
         try:
             import pandas as pd
-            return pd.DataFrame(self.extract_data())
+            names, rows = self._extract_rows()
+            return pd.DataFrame(rows, columns=names)
         except ImportError:
             raise ImportError("pandas is required for to_dataframe()")
 
 
 def get_sheet_names(filepath: str) -> List[str]:
-    """Get list of sheet names from an Excel file."""
-    wb = _get_cached_workbook(filepath)
-    return wb.sheetnames
+    """
+    Get list of sheet names from an Excel file.
+
+    Reads only xl/workbook.xml from the .xlsx archive rather than parsing every
+    sheet; falls back to openpyxl for anything that isn't a readable .xlsx.
+    """
+    if filepath in _workbook_cache:
+        return _workbook_cache[filepath].sheetnames
+    try:
+        with zipfile.ZipFile(filepath) as zf:
+            root = ElementTree.fromstring(zf.read('xl/workbook.xml'))
+        names = [sheet.get('name') for sheet in root.iterfind('{*}sheets/{*}sheet')]
+        if names and all(names):
+            return names
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError, OSError):
+        pass
+    return _get_cached_workbook(filepath).sheetnames
@@ -1,7 +1,14 @@
 """Heuristic metadata inference - no LLM needed"""
+import copy
 import re
+import threading
+import time
+from itertools import islice
 from typing import Dict, List, Optional, Any
 
+import psycopg2
+from psycopg2 import sql
+
 from ..storage import get_connection
 
 
@@ -39,26 +46,46 @@ NHS_ENTITIES = {
     },
 }
 
-# Column name patterns -> descriptions
-COLUMN_PATTERNS = [
-    (r'.*_count$', 'Count of {subject}'),
-    (r'.*_rate$', 'Rate per population'),
-    (r'.*_percentage$|.*_pct$|.*_percent$', 'Percentage value'),
-    (r'.*referral.*', 'Referral-related metric'),
-    (r'.*waiting.*', 'Waiting time or count'),
-    (r'.*admission.*', 'Hospital admission metric'),
-    (r'.*discharge.*', 'Hospital discharge metric'),
-    (r'.*attendance.*', 'Attendance count'),
-    (r'.*appointment.*', 'Appointment metric'),
-    (r'.*patient.*', 'Patient-related metric'),
-    (r'.*provider.*', 'Healthcare provider identifier'),
-    (r'.*commissioner.*', 'Commissioning organisation'),
-    (r'.*code$', 'Identifier code'),
-    (r'.*name$', 'Name field'),
-    (r'.*date$', 'Date field'),
-    (r'.*period$', 'Time period'),
+# Column name patterns -> descriptions, checked in priority order:
+# 1. Token after the last underscore (referral_count, seen_pct)
+COLUMN_SUFFIXES = {
+    'count': 'Count of {subject}',
+    'rate': 'Rate per population',
+    'percentage': 'Percentage value',
+    'pct': 'Percentage value',
+    'percent': 'Percentage value',
+}
+
+# 2. Keyword anywhere in the name - earlier entries win when several appear
+COLUMN_KEYWORDS = {
+    'referral': 'Referral-related metric',
+    'waiting': 'Waiting time or count',
+    'admission': 'Hospital admission metric',
+    'discharge': 'Hospital discharge metric',
+    'attendance': 'Attendance count',
+    'appointment': 'Appointment metric',
+    'patient': 'Patient-related metric',
+    'provider': 'Healthcare provider identifier',
+    'commissioner': 'Commissioning organisation',
+}
+
+# 3. Bare ending, no separator needed (postcode, org_name)
+COLUMN_ENDINGS = [
+    ('code', 'Identifier code'),
+    ('name', 'Name field'),
+    ('date', 'Date field'),
+    ('period', 'Time period'),
 ]
 
+# Single pass over the name finds every keyword (lookahead allows overlaps)
+_KEYWORD_RE = re.compile('(?=(' + '|'.join(COLUMN_KEYWORDS) + '))')
+_KEYWORD_RANK = {keyword: rank for rank, keyword in enumerate(COLUMN_KEYWORDS)}
+
+# One alternation identifies a sample value's entity in a single match.
+# The specific patterns are mutually exclusive and 'ods' (listed last) accepts
+# all of them, so every match also counts towards 'ods'.
+_ENTITY_RE = re.compile('|'.join(f"(?P<{name}>{info['pattern']})" for name, info in NHS_ENTITIES.items()))
+
 # Known columns with exact descriptions
 KNOWN_COLUMNS = {
     'icb_code': 'Integrated Care Board identifier (QXX format)',
@@ -81,6 +108,22 @@ KNOWN_COLUMNS = {
     'attendances': 'Number of attendances',
 }
 
+# Sample values examined when detecting an NHS entity type
+MAX_ENTITY_SAMPLES = 10
+
+# Rows read per table to collect sample values for all columns in one query
+SAMPLE_SCAN_ROWS = 500
+# Tables larger than this are sampled with TABLESAMPLE instead of read from the start
+TABLESAMPLE_MIN_ROWS = 50000
+
+# Table metadata is cached briefly - MCP clients ask for the same schema repeatedly
+METADATA_CACHE_TTL = 30  # seconds
+_metadata_cache: Dict[tuple, tuple] = {}  # (schema, table) -> (expires_at, metadata)
+_metadata_cache_lock = threading.Lock()
+# Column lists for a whole schema from one catalog query, shared by every
+# table's introspection - information_schema is slow to query table by table
+_schema_columns_cache: Dict[str, tuple] = {}  # schema -> (expires_at, {table: [(column, type)]})
+
 
 def infer_column_description(
     column_name: str,
@@ -98,9 +141,11 @@ def infer_column_description(
     Returns:
         Human-readable description
     """
+    # Check known columns first - most sanitized names are already lowercase
+    known = KNOWN_COLUMNS.get(column_name)
+    if known:
+        return known
     col_lower = column_name.lower()
-
-    # Check known columns first
     if col_lower in KNOWN_COLUMNS:
         return KNOWN_COLUMNS[col_lower]
 
@@ -112,20 +157,36 @@ def infer_column_description(
             return f"{entity_info['description']} (e.g., {entity_info['example']})"
 
     # Check column name patterns
-    for pattern, template in COLUMN_PATTERNS:
-        if re.match(pattern, col_lower):
-            # Extract subject from column name if template needs it
-            if '{subject}' in template:
-                # Extract subject: referral_count -> referrals
-                subject = col_lower.replace('_count', '').replace('_rate', '').replace('_', ' ')
-                return template.format(subject=subject)
-            return template
+    template = _match_column_pattern(col_lower)
+    if template:
+        # Extract subject from column name if template needs it
+        if '{subject}' in template:
+            # Extract subject: referral_count -> referrals
+            subject = col_lower.replace('_count', '').replace('_rate', '').replace('_', ' ')
+            return template.format(subject=subject)
+        return template
 
     # Default: humanize the column name
     humanized = column_name.replace('_', ' ').title()
     return f"{humanized} value"
 
 
+def _match_column_pattern(col_lower: str) -> Optional[str]:
+    """Return the description template for a lowercased column name, or None."""
+    _, sep, token = col_lower.rpartition('_')
+    if sep and token in COLUMN_SUFFIXES:
+        return COLUMN_SUFFIXES[token]
+
+    keywords = _KEYWORD_RE.findall(col_lower)
+    if keywords:
+        return COLUMN_KEYWORDS[min(keywords, key=_KEYWORD_RANK.__getitem__)]
+
+    for ending, template in COLUMN_ENDINGS:
+        if col_lower.endswith(ending):
+            return template
+    return None
+
+
 def infer_entity_type(sample_values: List[Any]) -> Optional[str]:
     """
     Detect NHS entity type from sample values.
@@ -135,16 +196,24 @@ def infer_entity_type(sample_values: List[Any]) -> Optional[str]:
     if not sample_values:
         return None
 
-    # Convert to strings and filter nulls
-    str_values = [str(v).strip() for v in sample_values if v is not None and str(v).strip()]
+    # Convert to strings and filter nulls, looking at no more than 10 values
+    stripped = (str(v).strip() for v in sample_values if v is not None)
+    str_values = list(islice((v for v in stripped if v), MAX_ENTITY_SAMPLES))
 
     if not str_values:
         return None
 
+    # Classify each value once
+    counts = dict.fromkeys(NHS_ENTITIES, 0)
+    for v in str_values:
+        match = _ENTITY_RE.match(v)
+        if match:
+            counts[match.lastgroup] += 1
+            if match.lastgroup != 'ods':
+                counts['ods'] += 1
+
     # Check each entity pattern
-    for entity_type, info in NHS_ENTITIES.items():
-        pattern = info['pattern']
-        matches = sum(1 for v in str_values if re.match(pattern, v))
+    for entity_type, matches in counts.items():
         # If >50% match, likely this entity type
         if matches > len(str_values) * 0.5:
             return entity_type
@@ -156,48 +225,138 @@ def get_table_metadata(table_name: str, schema: str = 'staging') -> Dict:
     """
     Get metadata for a table including column descriptions.
 
+    Results are cached for METADATA_CACHE_TTL seconds. Each call returns its
+    own copy, so callers may modify it.
+
     Returns dict with:
         - table_name
         - schema
         - row_count
         - columns: list of {name, type, description, sample_values}
     """
-    full_table = f'{schema}.{table_name}'
-
+    return copy.deepcopy(_cached_table_metadata(table_name, schema))
+
+
+def _cached_table_metadata(table_name: str, schema: str, cur=None) -> Dict:
+    """Shared cached metadata for a table, introspected on cur if given (don't modify)."""
+    key = (schema, table_name)
+    with _metadata_cache_lock:
+        cached = _metadata_cache.get(key)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    if cur is None:
+        metadata = _query_table_metadata(table_name, schema)
+    else:
+        metadata = _introspect_in_savepoint(cur, table_name, schema)
+    with _metadata_cache_lock:
+        _metadata_cache[key] = (time.monotonic() + METADATA_CACHE_TTL, metadata)
+    return metadata
+
+
+def clear_metadata_cache() -> None:
+    """Drop cached table metadata, e.g. after loading new data in-process."""
+    with _metadata_cache_lock:
+        _metadata_cache.clear()
+        _schema_columns_cache.clear()
+
+
+def _schema_columns(cur, schema: str) -> Dict[str, List[tuple]]:
+    """(column_name, data_type) in ordinal order for every table in a schema (cached)."""
+    with _metadata_cache_lock:
+        cached = _schema_columns_cache.get(schema)
+    if cached and cached[0] > time.monotonic():
+        return cached[1]
+
+    cur.execute("""
+        SELECT table_name, column_name, data_type
+        FROM information_schema.columns
+        WHERE table_schema = %s
+        ORDER BY table_name, ordinal_position
+    """, (schema,))
+    columns: Dict[str, List[tuple]] = {}
+    for table, column, data_type in cur.fetchall():
+        columns.setdefault(table, []).append((column, data_type))
+
+    with _metadata_cache_lock:
+        _schema_columns_cache[schema] = (time.monotonic() + METADATA_CACHE_TTL, columns)
+    return columns
+
+
+def _query_table_metadata(table_name: str, schema: str) -> Dict:
+    """Introspect a table on its own connection."""
     with get_connection() as conn:
         with conn.cursor() as cur:
-            # Get row count
-            cur.execute(f"SELECT COUNT(*) FROM {full_table}")
-            row_count = cur.fetchone()[0]
-
-            # Get column info
-            cur.execute(f"""
-                SELECT column_name, data_type
-                FROM information_schema.columns
-                WHERE table_schema = %s AND table_name = %s
-                ORDER BY ordinal_position
-            """, (schema, table_name))
-            columns_info = cur.fetchall()
-
-            columns = []
-            for col_name, col_type in columns_info:
-                # Get sample values
-                cur.execute(f"""
-                    SELECT DISTINCT "{col_name}"
-                    FROM {full_table}
-                    WHERE "{col_name}" IS NOT NULL
-                    LIMIT 10
-                """)
-                sample_values = [row[0] for row in cur.fetchall()]
-
-                description = infer_column_description(col_name, sample_values)
-
-                columns.append({
-                    'name': col_name,
-                    'type': col_type,
-                    'description': description,
-                    'sample_values': sample_values[:5],  # Limit for display
-                })
+            return _introspect_table(cur, table_name, schema)
+
+
+def _introspect_in_savepoint(cur, table_name: str, schema: str) -> Dict:
+    """Introspect a table on a shared cursor; a failure undoes only this table's queries."""
+    cur.execute("SAVEPOINT dw_table_metadata")
+    try:
+        metadata = _introspect_table(cur, table_name, schema)
+    except psycopg2.Error:
+        cur.execute("ROLLBACK TO SAVEPOINT dw_table_metadata")
+        raise
+    cur.execute("RELEASE SAVEPOINT dw_table_metadata")
+    return metadata
+
+
+def _introspect_table(cur, table_name: str, schema: str) -> Dict:
+    """Introspect a table: row count, columns, samples and descriptions."""
+    full_table = sql.SQL('{}.{}').format(sql.Identifier(schema), sql.Identifier(table_name))
+
+    # Get row count
+    cur.execute(sql.SQL("SELECT COUNT(*) FROM {}").format(full_table))
+    row_count = cur.fetchone()[0]
+
+    # Get column info - a table created since the schema snapshot is looked up alone
+    columns_info = _schema_columns(cur, schema).get(table_name)
+    if columns_info is None:
+        cur.execute("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s
+            ORDER BY ordinal_position
+        """, (schema, table_name))
+        columns_info = cur.fetchall()
+
+    # One scan gives samples for every column, instead of a DISTINCT
+    # query per column. Large tables are sampled by page so values
+    # come from across the table, not just the first loaded period.
+    samples = {col_name: [] for col_name, _ in columns_info}
+    if columns_info:
+        col_list = sql.SQL(', ').join(sql.Identifier(col_name) for col_name, _ in columns_info)
+        rows = []
+        if row_count > TABLESAMPLE_MIN_ROWS:
+            percent = min(100.0, 200.0 * SAMPLE_SCAN_ROWS / row_count)
+            cur.execute(
+                sql.SQL("SELECT {} FROM {} TABLESAMPLE SYSTEM (%s) LIMIT %s").format(col_list, full_table),
+                (percent, SAMPLE_SCAN_ROWS),
+            )
+            rows = cur.fetchall()
+        if not rows:
+            cur.execute(sql.SQL("SELECT {} FROM {} LIMIT %s").format(col_list, full_table),
+                        (SAMPLE_SCAN_ROWS,))
+            rows = cur.fetchall()
+
+        for row in rows:
+            for (col_name, _), value in zip(columns_info, row):
+                values = samples[col_name]
+                if value is not None and len(values) < MAX_ENTITY_SAMPLES and value not in values:
+                    values.append(value)
+
+    columns = []
+    for col_name, col_type in columns_info:
+        sample_values = samples[col_name]
+        description = infer_column_description(col_name, sample_values)
+
+        columns.append({
+            'name': col_name,
+            'type': col_type,
+            'description': description,
+            'sample_values': sample_values[:5],  # Limit for display
+        })
 
     return {
         'table_name': table_name,
@@ -208,7 +367,13 @@ def get_table_metadata(table_name: str, schema: str = 'staging') -> Dict:
 
 
 def get_all_tables_metadata(schema: str = 'staging') -> List[Dict]:
-    """Get metadata for all tables in a schema."""
+    """
+    Get metadata for all tables in a schema.
+
+    Uses one connection for every table, and fills the same cache as
+    get_table_metadata(). A table that fails to introspect is left out
+    rather than aborting the whole listing.
+    """
     with get_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
@@ -218,5 +383,11 @@ def get_all_tables_metadata(schema: str = 'staging') -> List[Dict]:
                 ORDER BY table_name
             """, (schema,))
             tables = [row[0] for row in cur.fetchall()]
-
-    return [get_table_metadata(t, schema) for t in tables]
+            metadata = []
+            for t in tables:
+                try:
+                    metadata.append(_cached_table_metadata(t, schema, cur))
+                except psycopg2.Error:
+                    continue  # Dropped since the listing, or unreadable - leave it out
+
+    return copy.deepcopy(metadata)
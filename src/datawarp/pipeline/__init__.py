@@ -1,3 +1,6 @@
 """Pipeline configuration and management"""
 from .config import PipelineConfig, FilePattern, SheetMapping
-from .repository import save_config, load_config, list_configs, record_load, get_load_history
+from .repository import (
+    save_config, load_config, list_configs, record_load, record_loads, LoadRecord, get_load_history,
+    refresh_pipeline_status, get_pipeline_status, get_source_hashes, get_configs_version,
+)
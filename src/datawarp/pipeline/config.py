@@ -1,7 +1,15 @@
 """Pipeline configuration dataclasses"""
 from dataclasses import dataclass, field, asdict
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
 import json
+import re
+
+
+@lru_cache(maxsize=256)
+def _compile_patterns(patterns: Tuple[str, ...]) -> Tuple[Pattern, ...]:
+    """Compile filename patterns once per distinct pattern list."""
+    return tuple(re.compile(p, re.IGNORECASE) for p in patterns)
 
 
 @dataclass
@@ -48,6 +56,11 @@ class FilePattern:
     file_types: List[str] = field(default_factory=lambda: ['xlsx'])
     sheet_mappings: List[SheetMapping] = field(default_factory=list)
 
+    def matches(self, filename: str) -> bool:
+        """True if ANY filename pattern matches (case-insensitive, anchored at start)."""
+        # Keyed on the current tuple, so patterns appended later are picked up
+        return any(rx.match(filename) for rx in _compile_patterns(tuple(self.filename_patterns)))
+
     def to_dict(self) -> dict:
         return {
             'filename_patterns': self.filename_patterns,
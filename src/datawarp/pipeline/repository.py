@@ -1,8 +1,11 @@
 """Pipeline configuration persistence"""
 import json
-from typing import List, Optional
+from typing import Dict, List, NamedTuple, Optional
 from datetime import datetime
 
+from psycopg2 import errors as pg_errors
+from psycopg2.extras import execute_values
+
 from ..storage import get_connection
 from .config import PipelineConfig
 
@@ -36,16 +39,28 @@ def load_config(pipeline_id: str) -> Optional[PipelineConfig]:
 
 def list_configs() -> List[PipelineConfig]:
     """List all pipeline configurations."""
-    configs = []
     with get_connection() as conn:
         with conn.cursor() as cur:
+            # Aggregate server-side so all configs arrive as a single row
             cur.execute("""
-                SELECT config FROM datawarp.tbl_pipeline_configs
-                ORDER BY pipeline_id
+                SELECT jsonb_agg(config ORDER BY pipeline_id)
+                FROM datawarp.tbl_pipeline_configs
             """)
-            for row in cur.fetchall():
-                configs.append(PipelineConfig.from_dict(row[0]))
-    return configs
+            configs = cur.fetchone()[0] or []
+    return [PipelineConfig.from_dict(c) for c in configs]
+
+
+def get_configs_version() -> tuple:
+    """
+    Cheap change token for the saved configs: (count, latest updated_at).
+
+    Lets long-running readers (MCP server) reuse list_configs() results until
+    another process saves or deletes a config.
+    """
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*), MAX(updated_at) FROM datawarp.tbl_pipeline_configs")
+            return tuple(cur.fetchone())
 
 
 def delete_config(pipeline_id: str) -> bool:
@@ -59,6 +74,36 @@ def delete_config(pipeline_id: str) -> bool:
             return cur.rowcount > 0
 
 
+class LoadRecord(NamedTuple):
+    """One row of tbl_load_history, for batching with record_loads()."""
+    pipeline_id: str
+    period: str
+    table_name: str
+    source_file: str
+    sheet_name: Optional[str]
+    rows_loaded: int
+    source_rows: Optional[int] = None
+    source_columns: Optional[int] = None
+    source_path: Optional[str] = None
+    source_hash: Optional[str] = None
+
+
+_UPSERT_LOAD_SQL = """
+    INSERT INTO datawarp.tbl_load_history
+    (pipeline_id, period, table_name, source_file, sheet_name, rows_loaded,
+     source_rows, source_columns, source_path, source_hash)
+    VALUES {values}
+    ON CONFLICT (pipeline_id, period, table_name, sheet_name)
+    DO UPDATE SET
+        rows_loaded = EXCLUDED.rows_loaded,
+        source_rows = EXCLUDED.source_rows,
+        source_columns = EXCLUDED.source_columns,
+        source_path = EXCLUDED.source_path,
+        source_hash = EXCLUDED.source_hash,
+        loaded_at = NOW()
+"""
+
+
 def record_load(
     pipeline_id: str,
     period: str,
@@ -69,24 +114,33 @@ def record_load(
     source_rows: Optional[int] = None,
     source_columns: Optional[int] = None,
     source_path: Optional[str] = None,
+    source_hash: Optional[str] = None,
 ) -> None:
     """Record a successful data load with source metrics for reconciliation."""
     with get_connection() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
-                INSERT INTO datawarp.tbl_load_history
+            cur.execute(
+                _UPSERT_LOAD_SQL.format(values='(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)'),
                 (pipeline_id, period, table_name, source_file, sheet_name, rows_loaded,
-                 source_rows, source_columns, source_path)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (pipeline_id, period, table_name, sheet_name)
-                DO UPDATE SET
-                    rows_loaded = EXCLUDED.rows_loaded,
-                    source_rows = EXCLUDED.source_rows,
-                    source_columns = EXCLUDED.source_columns,
-                    source_path = EXCLUDED.source_path,
-                    loaded_at = NOW()
-            """, (pipeline_id, period, table_name, source_file, sheet_name, rows_loaded,
-                  source_rows, source_columns, source_path))
+                 source_rows, source_columns, source_path, source_hash),
+            )
+
+
+def record_loads(records: List[LoadRecord]) -> None:
+    """Record many loads in one statement and one commit (e.g. all sheets of a period)."""
+    # One upsert can't touch the same row twice - keep the last record per key,
+    # matching what successive record_load() calls would leave behind.
+    # NULL sheet names never conflict, so those rows are all kept.
+    latest = {}
+    for i, r in enumerate(records):
+        key = (r.pipeline_id, r.period, r.table_name, r.sheet_name) if r.sheet_name is not None else i
+        latest.pop(key, None)
+        latest[key] = r
+    if not latest:
+        return
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            execute_values(cur, _UPSERT_LOAD_SQL.format(values='%s'), list(latest.values()))
 
 
 def get_load_history(pipeline_id: str) -> List[dict]:
@@ -103,13 +157,71 @@ def get_load_history(pipeline_id: str) -> List[dict]:
             return [dict(zip(columns, row)) for row in cur.fetchall()]
 
 
+def get_source_hashes(pipeline_id: str, period: str) -> Dict[tuple, str]:
+    """Source file hash of each load recorded for a period: {(table_name, sheet_name): hash}."""
+    with get_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT table_name, sheet_name, source_hash FROM datawarp.tbl_load_history
+                WHERE pipeline_id = %s AND period = %s AND source_hash IS NOT NULL
+            """, (pipeline_id, period))
+            return {(table_name, sheet_name): h for table_name, sheet_name, h in cur.fetchall()}
+
+
 def get_loaded_periods(pipeline_id: str) -> List[str]:
     """Get list of periods that have been loaded for a pipeline."""
     with get_connection() as conn:
         with conn.cursor() as cur:
             cur.execute("""
-                SELECT DISTINCT period FROM datawarp.tbl_load_history
+                SELECT array_agg(DISTINCT period ORDER BY period)
+                FROM datawarp.tbl_load_history
                 WHERE pipeline_id = %s
-                ORDER BY period
             """, (pipeline_id,))
-            return [row[0] for row in cur.fetchall()]
+            return cur.fetchone()[0] or []
+
+
+# Same summary as the mv_pipeline_status view in sql/schema.sql, for databases
+# that don't have the view yet
+_PIPELINE_STATUS_SQL = """
+    SELECT pipeline_id, COUNT(DISTINCT period), COUNT(DISTINCT table_name), MAX(loaded_at)
+    FROM datawarp.tbl_load_history
+    GROUP BY pipeline_id
+"""
+
+
+def refresh_pipeline_status() -> None:
+    """
+    Rebuild the per-pipeline summary (mv_pipeline_status) after loading.
+
+    A no-op on a database without the view (sql/schema.sql not re-applied) -
+    the loads have already committed and get_pipeline_status() falls back.
+    """
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY datawarp.mv_pipeline_status")
+    except pg_errors.UndefinedTable:
+        pass
+
+
+def get_pipeline_status() -> Dict[str, dict]:
+    """
+    Get the load summary per pipeline: {pipeline_id: {period_count, table_count, last_loaded_at}}.
+
+    Read from mv_pipeline_status, or aggregated from load history if the view doesn't exist.
+    """
+    try:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT pipeline_id, period_count, table_count, last_loaded_at
+                    FROM datawarp.mv_pipeline_status
+                """)
+                rows = cur.fetchall()
+    except pg_errors.UndefinedTable:
+        with get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(_PIPELINE_STATUS_SQL)
+                rows = cur.fetchall()
+    columns = ['period_count', 'table_count', 'last_loaded_at']
+    return {row[0]: dict(zip(columns, row[1:])) for row in rows}
@@ -1,2 +1,2 @@
 """Database storage"""
-from .connection import get_connection, get_connection_string, test_connection
+from .connection import get_connection, get_connection_string, test_connection, init_pool, close_pool
@@ -1,15 +1,29 @@
 """PostgreSQL connection management"""
 import os
+import threading
 from contextlib import contextmanager
-from typing import Generator
+from typing import Generator, Optional
 
 import psycopg2
 from psycopg2.extensions import connection as PgConnection
+from psycopg2.pool import PoolError, ThreadedConnectionPool
 from dotenv import load_dotenv
 
 # Load .env file if present
 load_dotenv()
 
+# Optional process-wide pool - long-running processes (MCP server) opt in via init_pool()
+_pool: Optional[ThreadedConnectionPool] = None
+_pool_lock = threading.Lock()
+# One slot per pooled connection. getconn() fails at once when every connection
+# is out, so callers take a slot first and wait for one to come back instead.
+_pool_slots: Optional[threading.BoundedSemaphore] = None
+
+# Pool size: connections kept open, and the most handed out at once
+POOL_MIN_CONN = int(os.getenv('DATAWARP_POOL_MIN', '1'))
+POOL_MAX_CONN = int(os.getenv('DATAWARP_POOL_MAX', '8'))
+POOL_WAIT_TIMEOUT = float(os.getenv('DATAWARP_POOL_TIMEOUT', '30'))  # seconds to wait for a free connection
+
 
 def get_connection_string() -> str:
     """Build connection string from environment variables."""
@@ -22,25 +36,80 @@ def get_connection_string() -> str:
     return f"host={host} port={port} dbname={name} user={user} password={password}"
 
 
+def init_pool(minconn: int = POOL_MIN_CONN, maxconn: int = POOL_MAX_CONN) -> None:
+    """
+    Keep connections open and reuse them in get_connection().
+
+    Without a pool every get_connection() call pays the TCP and auth
+    handshake. Call at startup in long-running processes; later calls are
+    no-ops once the pool exists, so it is safe to call again to retry.
+    """
+    global _pool, _pool_slots
+    if _pool is not None:
+        return
+    with _pool_lock:
+        if _pool is None:
+            _pool_slots = threading.BoundedSemaphore(maxconn)
+            _pool = ThreadedConnectionPool(minconn, maxconn, get_connection_string())
+
+
+def close_pool() -> None:
+    """Close all pooled connections; get_connection() goes back to connect-per-call."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.closeall()
+            _pool = None
+
+
 @contextmanager
 def get_connection() -> Generator[PgConnection, None, None]:
     """
     Get a PostgreSQL connection as a context manager.
 
+    Commits on success and rolls back on error. Uses the pool if init_pool()
+    was called, otherwise opens a fresh connection.
+
     Usage:
         with get_connection() as conn:
             with conn.cursor() as cur:
                 cur.execute("SELECT 1")
     """
-    conn = psycopg2.connect(get_connection_string())
+    pool = _pool
+    if pool is None:
+        conn = psycopg2.connect(get_connection_string())
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        return
+
+    slots = _pool_slots
+    if not slots.acquire(timeout=POOL_WAIT_TIMEOUT):
+        raise PoolError(f"no pooled connection free after {POOL_WAIT_TIMEOUT:g}s")
+    try:
+        conn = pool.getconn()
+    except Exception:
+        slots.release()
+        raise
+    discard = False
     try:
         yield conn
         conn.commit()
+    except (psycopg2.OperationalError, psycopg2.InterfaceError):
+        # Connection is likely dead (server restart, idle timeout) - don't reuse it
+        discard = True
+        raise
     except Exception:
         conn.rollback()
         raise
     finally:
-        conn.close()
+        pool.putconn(conn, close=discard or bool(conn.closed))
+        slots.release()
 
 
 def test_connection() -> bool:
@@ -1,3 +1,4 @@
 """Utility functions"""
 from .period import parse_period, parse_period_range, extract_periods_from_files, extract_period_from_url
 from .sanitize import sanitize_name, make_table_name
+from .sql_check import is_single_select, strip_trailing_terminator
@@ -22,6 +22,17 @@ MONTHS = {
 # Build regex for month names
 MONTH_PATTERN = '|'.join(sorted(MONTHS.keys(), key=len, reverse=True))
 
+# Compiled once at import - period parsing runs for every file on every scan
+_MONTH_YEAR_RE = re.compile(rf'({MONTH_PATTERN})\s*[-_/]?\s*(20[1-3]\d)')
+_MONTH_RANGE_RE = re.compile(rf'({MONTH_PATTERN})[-–—/\s]+({MONTH_PATTERN})\s+(20[1-3]\d)')
+_MONTH_RE = re.compile(rf'({MONTH_PATTERN})')
+_ISO_RE = re.compile(r'(20[1-3]\d)[-_/](\d{2})')
+_QUARTER_RE = re.compile(r'q([1-4])[-_\s]?(\d{2,4})')
+_YEAR_RE = re.compile(r'(20[1-3]\d)')
+_COMPACT_RE = re.compile(r'(\d{6})')
+_SHORT_YEAR_RE = re.compile(r'(\d{2})(?!\d)')
+_YEAR_ONLY_RE = re.compile(r'(?:^|[\s_-])(20[1-3]\d)(?:[\s_-]|$)')
+
 
 def _extract_all_month_years(text: str) -> List[Tuple[str, str]]:
     """Extract ALL month-year pairs from text, ordered by position.
@@ -34,14 +45,14 @@ def _extract_all_month_years(text: str) -> List[Tuple[str, str]]:
     results = []
 
     # Find all month-name + year pairs (e.g., "october 2019", "september 2025")
-    for match in re.finditer(rf'({MONTH_PATTERN})\s*[-_/]?\s*(20[1-3]\d)', text_lower):
+    for match in _MONTH_YEAR_RE.finditer(text_lower):
         month_num = MONTHS.get(match.group(1))
         year = match.group(2)
         if month_num:
             results.append((year, month_num, match.start()))
 
     # Handle "Month1-Month2 Year" pattern (e.g., "Jan-Sep 2025")
-    range_match = re.search(rf'({MONTH_PATTERN})[-–—/\s]+({MONTH_PATTERN})\s+(20[1-3]\d)', text_lower)
+    range_match = _MONTH_RANGE_RE.search(text_lower)
     if range_match:
         month1 = MONTHS.get(range_match.group(1))
         month2 = MONTHS.get(range_match.group(2))
@@ -51,7 +62,7 @@ def _extract_all_month_years(text: str) -> List[Tuple[str, str]]:
             results.append((year, month2, range_match.start() + 1))
 
     # Also check year-month patterns (2025-09)
-    for match in re.finditer(r'(20[1-3]\d)[-_/](\d{2})', text_lower):
+    for match in _ISO_RE.finditer(text_lower):
         yr, mo = match.groups()
         if 1 <= int(mo) <= 12:
             results.append((yr, mo, match.start()))
@@ -79,7 +90,7 @@ def _extract_month_year(text: str) -> Optional[Tuple[str, str]]:
 
     # Try quarterly pattern first (q1-2526, q2-25, q3-2025)
     # UK Financial Year: Q1=Apr, Q2=Jul, Q3=Oct, Q4=Jan(next year)
-    quarter_match = re.search(r'q([1-4])[-_\s]?(\d{2,4})', text_lower)
+    quarter_match = _QUARTER_RE.search(text_lower)
     if quarter_match:
         quarter = int(quarter_match.group(1))
         year_part = quarter_match.group(2)
@@ -106,14 +117,14 @@ def _extract_month_year(text: str) -> Optional[Tuple[str, str]]:
         return (year, month)
 
     # Try to find month name
-    month_match = re.search(rf'({MONTH_PATTERN})', text_lower)
+    month_match = _MONTH_RE.search(text_lower)
     month_num = None
 
     if month_match:
         month_num = MONTHS.get(month_match.group(1))
 
     # Try to find 4-digit year
-    year_match = re.search(r'(20[1-3]\d)', text_lower)
+    year_match = _YEAR_RE.search(text_lower)
     year = year_match.group(1) if year_match else None
 
     # If we have both month name and year, we're done
@@ -121,7 +132,7 @@ def _extract_month_year(text: str) -> Optional[Tuple[str, str]]:
         return (year, month_num)
 
     # Try compact formats: YYYYMM or MMYYYY
-    compact_match = re.search(r'(\d{6})', text_lower)
+    compact_match = _COMPACT_RE.search(text_lower)
     if compact_match:
         digits = compact_match.group(1)
         # Try YYYYMM first
@@ -133,14 +144,14 @@ def _extract_month_year(text: str) -> Optional[Tuple[str, str]]:
 
     # Try 2-digit year with month name (nov25)
     if month_num:
-        short_year = re.search(r'(\d{2})(?!\d)', text_lower)
+        short_year = _SHORT_YEAR_RE.search(text_lower)
         if short_year:
             yr = int(short_year.group(1))
             if 20 <= yr <= 35:  # 2020-2035
                 return (f"20{yr}", month_num)
 
     # Try ISO format: 2024-11
-    iso_match = re.search(r'(20[1-3]\d)[-_/](\d{2})', text_lower)
+    iso_match = _ISO_RE.search(text_lower)
     if iso_match:
         yr, mo = iso_match.groups()
         if 1 <= int(mo) <= 12:
@@ -185,7 +196,7 @@ def parse_period(text: str) -> Optional[str]:
         return f"{year}-{month}"
 
     # Fallback: year-only pattern (e.g., "2020", "data 2020", "data_2023")
-    year_match = re.search(r'(?:^|[\s_-])(20[1-3]\d)(?:[\s_-]|$)', text)
+    year_match = _YEAR_ONLY_RE.search(text)
     if year_match:
         return f"{year_match.group(1)}-01"  # Default to January
 
@@ -1,8 +1,16 @@
 """Name sanitization for PostgreSQL identifiers"""
 import re
+from functools import lru_cache
 from typing import Optional
 
+# Compiled once - sanitize_name runs for every column of every load
+_SEPARATORS_RE = re.compile(r'[\s\-./\\()]+')
+_INVALID_CHARS_RE = re.compile(r'[^a-z0-9_]')
+_MULTI_UNDERSCORE_RE = re.compile(r'_+')
 
+
+# Pure function of the name, and the same headers recur in every period's load
+@lru_cache(maxsize=8192)
 def sanitize_name(name: str) -> str:
     """
     Convert a string to a PostgreSQL-safe identifier.
@@ -20,13 +28,13 @@ def sanitize_name(name: str) -> str:
     result = name.lower()
 
     # Replace common separators with underscore
-    result = re.sub(r'[\s\-./\\()]+', '_', result)
+    result = _SEPARATORS_RE.sub('_', result)
 
     # Remove any remaining non-alphanumeric (except underscore)
-    result = re.sub(r'[^a-z0-9_]', '', result)
+    result = _INVALID_CHARS_RE.sub('', result)
 
     # Collapse multiple underscores
-    result = re.sub(r'_+', '_', result)
+    result = _MULTI_UNDERSCORE_RE.sub('_', result)
 
     # Strip leading/trailing underscores
     result = result.strip('_')
@@ -0,0 +1,111 @@
+"""Lightweight checks on user SQL for the read-only query tool (no parser dependency)"""
+import re
+from functools import lru_cache
+from typing import Iterator
+
+# Literals and comments are matched whole so words inside them are never seen;
+# anything not matched (numbers, operators, whitespace) is skipped
+_TOKEN_RE = re.compile(r"""
+    [Ee]'(?:[^'\\]|\\.|'')*'?       # escape string literal (E'it\'s')
+  | '(?:[^']|'')*'?                 # string literal
+  | "(?:[^"]|"")*"?                 # quoted identifier
+  | --[^\n]*                        # line comment
+  | /\*.*?(?:\*/|\Z)                # block comment
+  | \$(\w*)\$.*?(?:\$\1\$|\Z)       # dollar-quoted string
+  | [();]
+  | [A-Za-z_][A-Za-z0-9_$]*         # keyword or identifier
+""", re.VERBOSE | re.DOTALL)
+
+# The same literals and comments, closed. An unclosed one swallows the rest of
+# the input, so the checks below would see nothing after it.
+_CLOSED_RE = re.compile(r"""
+    [Ee]'(?:[^'\\]|\\.|'')*'
+  | '(?:[^']|'')*'
+  | "(?:[^"]|"")*"
+  | /\*.*?\*/
+  | \$(\w*)\$.*?\$\1\$
+""", re.VERBOSE | re.DOTALL)
+
+
+# Keywords that start a statement's main clause (after any WITH ... AS (...) list)
+_STATEMENT_KEYWORDS = {'select', 'insert', 'update', 'delete', 'merge', 'values', 'table'}
+
+
+_UNCLOSED = '<unclosed>'
+
+
+def _is_unclosed(token: str) -> bool:
+    """True for a literal or block comment token that runs off the end of the input."""
+    opens_literal = (token[0] in '\'"$' or token.startswith('/*')
+                     or (token[0] in 'Ee' and token[1:2] == "'"))
+    return opens_literal and not _CLOSED_RE.fullmatch(token)
+
+
+def _top_level_words(sql: str) -> Iterator[str]:
+    """
+    Lowercased words (and ';') outside literals, comments and parentheses.
+
+    Ends with _UNCLOSED at an unclosed literal or comment - whatever the
+    server makes of the rest, it isn't known to be a single statement.
+    """
+    depth = 0
+    for match in _TOKEN_RE.finditer(sql):
+        token = match.group()
+        if _is_unclosed(token):
+            yield _UNCLOSED
+            return
+        if token == '(':
+            depth += 1
+        elif token == ')':
+            depth -= 1
+        elif depth == 0 and (token == ';' or token[0].isalpha() or token[0] == '_'):
+            yield token.lower()
+
+
+# Clients often re-send identical SQL
+@lru_cache(maxsize=256)
+def is_single_select(sql: str) -> bool:
+    """
+    True if sql is exactly one SELECT statement, optionally behind a WITH list.
+
+    Rejects anything after a ';'. Statements nested in parentheses (e.g. a
+    data-modifying CTE) aren't inspected - run the query read-only as well.
+    """
+    words = list(_top_level_words(sql))
+    while words and words[-1] == ';':
+        words.pop()
+    if not words or ';' in words or _UNCLOSED in words:
+        return False
+    if words[0] == 'with':
+        return next((w for w in words if w in _STATEMENT_KEYWORDS), None) == 'select'
+    return words[0] == 'select'
+
+
+@lru_cache(maxsize=256)
+def strip_trailing_terminator(sql: str) -> str:
+    """
+    sql without its trailing top-level ';'s and comments, so it can be nested or extended.
+
+    'select 1; -- done' becomes 'select 1'. A ';' or comment inside a literal
+    or parentheses is kept.
+    """
+    tail_start = None  # where the trailing run of ';'s and comments begins
+    pos = 0
+    depth = 0
+    for match in _TOKEN_RE.finditer(sql):
+        token = match.group()
+        if sql[pos:match.start()].strip():
+            tail_start = None  # unmatched text (a number, an operator) ends the run
+        if depth == 0 and (token == ';' or token.startswith(('--', '/*'))):
+            if tail_start is None:
+                tail_start = match.start()
+        else:
+            tail_start = None
+            if token == '(':
+                depth += 1
+            elif token == ')':
+                depth -= 1
+        pos = match.end()
+    if sql[pos:].strip():
+        tail_start = None
+    return sql[:tail_start].rstrip()
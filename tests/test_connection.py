@@ -0,0 +1,69 @@
+"""Test that pooled get_connection() waits for a free connection - no DB needed."""
+import threading
+
+import pytest
+from psycopg2.pool import PoolError
+
+from datawarp.storage import connection
+
+
+class FakeConnection:
+    closed = 0
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakePool:
+    """Fails getconn() once maxconn connections are out, like ThreadedConnectionPool."""
+
+    def __init__(self, minconn, maxconn, dsn):
+        self.maxconn = maxconn
+        self.out = 0
+
+    def getconn(self):
+        if self.out >= self.maxconn:
+            raise PoolError("connection pool exhausted")
+        self.out += 1
+        return FakeConnection()
+
+    def putconn(self, conn, close=False):
+        self.out -= 1
+
+    def closeall(self):
+        pass
+
+
+@pytest.fixture
+def pool_of_one(monkeypatch):
+    monkeypatch.setattr(connection, 'ThreadedConnectionPool', FakePool)
+    connection.close_pool()
+    connection.init_pool(1, 1)
+    yield
+    connection.close_pool()
+
+
+def test_waits_for_a_connection_to_come_back(pool_of_one):
+    got_second = threading.Event()
+
+    def second_caller():
+        with connection.get_connection():
+            got_second.set()
+
+    with connection.get_connection():
+        thread = threading.Thread(target=second_caller)
+        thread.start()
+        assert not got_second.wait(0.1)  # blocked, not failed
+    thread.join(5)
+    assert got_second.is_set()
+
+
+def test_gives_up_after_timeout(pool_of_one, monkeypatch):
+    monkeypatch.setattr(connection, 'POOL_WAIT_TIMEOUT', 0.05)
+    with connection.get_connection():
+        with pytest.raises(PoolError):
+            with connection.get_connection():
+                pass
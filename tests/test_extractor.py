@@ -0,0 +1,108 @@
+"""Test FileExtractor structure detection and data extraction."""
+import pytest
+import openpyxl
+
+from datawarp.loader import extractor
+from datawarp.loader.extractor import FileExtractor, SheetType, clear_workbook_cache, get_sheet_names
+
+
+@pytest.fixture
+def workbook(tmp_path):
+    """NHS-style sheet: title rows, merged two-row header, data, repeated header, footer."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = 'Data'
+    ws['A1'] = 'Table 1: Referrals by ICB'
+    ws['A2'] = 'This table shows referrals'
+
+    # Two-row header with a merged group label over C:D
+    ws['A4'] = 'ICB Code'
+    ws['B4'] = 'ICB Name'
+    ws['C4'] = 'Referrals'
+    ws.merge_cells('C4:D4')
+    ws['E4'] = 'Rate'
+    ws['C5'] = 'Open'
+    ws['D5'] = 'Closed'
+    ws['E5'] = '%'
+
+    data = [
+        ('QWE', 'South West London', 120, 45, 1.5),
+        ('QHM', 'North East', 98, '*', 2.25),
+        ('QOP', 'Greater Manchester', 310, 120, 0.75),
+    ]
+    for i, row in enumerate(data, start=6):
+        for j, val in enumerate(row, start=1):
+            ws.cell(row=i, column=j, value=val)
+
+    # Section separator repeating the header, then more data
+    for j, val in enumerate(['ICB Code', 'ICB Name', 'Referrals', None, 'Rate'], start=1):
+        ws.cell(row=9, column=j, value=val)
+    for j, val in enumerate(('QKK', 'South East London', 150, 60, 1.0), start=1):
+        ws.cell(row=10, column=j, value=val)
+
+    ws['A12'] = 'Source: NHS England'
+
+    # Sparse documentation sheet
+    notes = wb.create_sheet('Notes')
+    notes['A1'] = 'Notes'
+    notes['A3'] = 'Referrals are counted at month end.'
+
+    path = tmp_path / 'referrals.xlsx'
+    wb.save(path)
+    yield str(path)
+    clear_workbook_cache()
+
+
+class TestFileExtractor:
+    """Extraction from a synthetic multi-row-header sheet."""
+
+    def test_structure(self, workbook):
+        structure = FileExtractor(workbook, 'Data').infer_structure()
+        assert structure.is_valid
+        assert structure.header_rows == [4, 5]
+        assert structure.data_start_row == 6
+        assert structure.data_end_row == 10
+        assert structure.get_column_names() == [
+            'icb_code', 'icb_name', 'referrals_open', 'referrals_closed', 'rate',
+        ]
+
+    def test_column_types(self, workbook):
+        columns = FileExtractor(workbook, 'Data').infer_structure().columns
+        types = {c.pg_name: c.inferred_type for c in columns.values()}
+        assert types['icb_code'] == 'VARCHAR(20)'
+        assert types['referrals_open'] == 'VARCHAR(255)'  # repeated header row adds text
+        assert types['rate'] == 'VARCHAR(255)'
+
+    def test_extract_data(self, workbook):
+        rows = FileExtractor(workbook, 'Data').extract_data()
+        assert [r['icb_code'] for r in rows] == ['QWE', 'QHM', 'QOP', 'QKK']
+        # Suppressed values become None
+        assert rows[1]['referrals_closed'] is None
+        assert rows[0] == {
+            'icb_code': 'QWE',
+            'icb_name': 'South West London',
+            'referrals_open': 120,
+            'referrals_closed': 45,
+            'rate': 1.5,
+        }
+
+    def test_to_dataframe_columns(self, workbook):
+        df = FileExtractor(workbook, 'Data').to_dataframe()
+        assert list(df.columns) == ['icb_code', 'icb_name', 'referrals_open', 'referrals_closed', 'rate']
+        assert len(df) == 4
+
+    def test_metadata_sheet(self, workbook):
+        structure = FileExtractor(workbook, 'Notes').infer_structure()
+        assert structure.sheet_type in (SheetType.METADATA, SheetType.EMPTY)
+        assert FileExtractor(workbook, 'Notes').extract_data() == []
+
+    def test_missing_sheet(self, workbook):
+        with pytest.raises(ValueError):
+            FileExtractor(workbook, 'Nope')
+
+
+class TestGetSheetNames:
+
+    def test_reads_names_without_loading_workbook(self, workbook):
+        assert get_sheet_names(workbook) == ['Data', 'Notes']
+        assert workbook not in extractor._workbook_cache
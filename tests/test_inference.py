@@ -0,0 +1,210 @@
+"""Test heuristic column description inference."""
+from contextlib import contextmanager
+
+import psycopg2.errors
+import pytest
+from datawarp.metadata import inference
+from datawarp.metadata.inference import infer_column_description, infer_entity_type
+
+
+class TestInferColumnDescription:
+    """Column name heuristics - no DB needed."""
+
+    def test_known_columns(self):
+        assert infer_column_description('icb_code') == 'Integrated Care Board identifier (QXX format)'
+        assert infer_column_description('ICB_Code') == 'Integrated Care Board identifier (QXX format)'
+        assert infer_column_description('period') == 'Reporting period in YYYY-MM format'
+
+    @pytest.mark.parametrize('column, expected', [
+        ('referral_count', 'Count of referral'),
+        ('waiting_count', 'Count of waiting'),
+        ('admission_rate', 'Rate per population'),
+        ('seen_pct', 'Percentage value'),
+        ('seen_percentage', 'Percentage value'),
+        ('total_referrals_received', 'Referral-related metric'),
+        ('patients_waiting', 'Waiting time or count'),
+        ('patient_referral', 'Referral-related metric'),
+        ('appointment_patient', 'Appointment metric'),
+        ('commissioner_patient_discharges', 'Hospital discharge metric'),
+        ('referral_waiting_rate', 'Rate per population'),
+        ('provider_org', 'Healthcare provider identifier'),
+        ('postcode', 'Identifier code'),
+        ('org_name', 'Name field'),
+        ('start_date', 'Date field'),
+        ('time_period', 'Time period'),
+    ])
+    def test_column_patterns(self, column, expected):
+        assert infer_column_description(column) == expected
+
+    def test_pattern_requires_underscore_for_count(self):
+        # '.*_count$' needs the separator, so this falls through to the default
+        assert infer_column_description('headcount') == 'Headcount value'
+
+    def test_default_humanizes(self):
+        assert infer_column_description('fte_staff') == 'Fte Staff value'
+
+    def test_sample_values_detect_entity(self):
+        desc = infer_column_description('org', ['QWE', 'QHM', 'QOP'])
+        assert desc == 'Integrated Care Board code (e.g., QWE)'
+
+
+class TestInferEntityType:
+    """Entity detection from sample values."""
+
+    def test_icb(self):
+        assert infer_entity_type(['QWE', 'QHM', 'QOP']) == 'icb'
+
+    def test_trust(self):
+        assert infer_entity_type(['RJ1', 'RXH', 'R0A']) == 'trust'
+
+    def test_gp_practice(self):
+        assert infer_entity_type(['A81001', 'B82005']) == 'gp_practice'
+
+    def test_ccg(self):
+        assert infer_entity_type(['00Q', '01A', '99C']) == 'ccg'
+
+    def test_region(self):
+        assert infer_entity_type(['Y56', 'Y58', 'Y60']) == 'region'
+
+    def test_mixed_codes_fall_back_to_ods(self):
+        # No single entity has a majority, but all values are ODS-shaped
+        assert infer_entity_type(['QWE', 'RJ1', 'Y56', 'A81001']) == 'ods'
+
+    def test_no_match(self):
+        assert infer_entity_type(['England', 'North East']) is None
+        assert infer_entity_type([None, '']) is None
+        assert infer_entity_type([]) is None
+
+
+class TestMetadataCache:
+    """get_table_metadata caches introspection results briefly."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        calls = []
+
+        def fake_query(table_name, schema):
+            calls.append((schema, table_name))
+            return {'table_name': table_name, 'columns': [{'name': 'period'}]}
+
+        monkeypatch.setattr(inference, '_query_table_metadata', fake_query)
+        inference.clear_metadata_cache()
+        yield calls
+        inference.clear_metadata_cache()
+
+    def test_second_call_is_cached(self, calls):
+        inference.get_table_metadata('t1')
+        inference.get_table_metadata('t1')
+        assert calls == [('staging', 't1')]
+
+    def test_returns_independent_copies(self, calls):
+        first = inference.get_table_metadata('t1')
+        first['columns'][0]['name'] = 'changed'
+        assert inference.get_table_metadata('t1')['columns'][0]['name'] == 'period'
+
+    def test_clear_and_expiry(self, calls, monkeypatch):
+        inference.get_table_metadata('t1')
+        inference.clear_metadata_cache()
+        inference.get_table_metadata('t1')
+        monkeypatch.setattr(inference, 'METADATA_CACHE_TTL', -1)
+        inference.clear_metadata_cache()
+        inference.get_table_metadata('t1')
+        inference.get_table_metadata('t1')
+        assert len(calls) == 4
+
+    def test_all_tables_use_one_connection_and_fill_cache(self, calls, monkeypatch):
+        connections = []
+        introspected = []
+
+        class FakeCursor:
+            def execute(self, query, params=None):
+                pass
+
+            def fetchall(self):
+                return [('t1',), ('t2',)]
+
+        class FakeConnection:
+            def cursor(self):
+                @contextmanager
+                def cur():
+                    yield FakeCursor()
+                return cur()
+
+        @contextmanager
+        def fake_connection():
+            connections.append(1)
+            yield FakeConnection()
+
+        def fake_introspect(cur, table_name, schema):
+            introspected.append(table_name)
+            return {'table_name': table_name, 'columns': []}
+
+        monkeypatch.setattr(inference, 'get_connection', fake_connection)
+        monkeypatch.setattr(inference, '_introspect_table', fake_introspect)
+        inference.get_table_metadata('t1')
+        metadata = inference.get_all_tables_metadata()
+        assert [m['table_name'] for m in metadata] == ['t1', 't2']
+        assert connections == [1]
+        assert introspected == ['t2']  # t1 was already cached
+        inference.get_table_metadata('t2')
+        assert calls == [('staging', 't1')]
+
+
+    def test_failed_table_is_rolled_back_and_skipped(self, calls, monkeypatch):
+        executed = []
+
+        class FakeCursor:
+            def execute(self, query, params=None):
+                executed.append(query)
+
+            def fetchall(self):
+                return [('t1',), ('t2',)]
+
+        class FakeConnection:
+            def cursor(self):
+                @contextmanager
+                def cur():
+                    yield FakeCursor()
+                return cur()
+
+        @contextmanager
+        def fake_connection():
+            yield FakeConnection()
+
+        def fake_introspect(cur, table_name, schema):
+            if table_name == 't1':
+                raise psycopg2.errors.UndefinedTable('relation "staging.t1" does not exist')
+            return {'table_name': table_name, 'columns': []}
+
+        monkeypatch.setattr(inference, 'get_connection', fake_connection)
+        monkeypatch.setattr(inference, '_introspect_table', fake_introspect)
+        metadata = inference.get_all_tables_metadata()
+        assert [m['table_name'] for m in metadata] == ['t2']
+        assert 'ROLLBACK TO SAVEPOINT dw_table_metadata' in executed
+        assert executed[-1] == 'RELEASE SAVEPOINT dw_table_metadata'
+
+
+class TestSchemaColumns:
+    """Column lists come from one catalog query per schema."""
+
+    class FakeCursor:
+        def __init__(self):
+            self.executed = []
+
+        def execute(self, query, params=None):
+            self.executed.append(params)
+
+        def fetchall(self):
+            return [('t1', 'period', 'text'), ('t1', 'value', 'integer'), ('t2', 'org', 'text')]
+
+    def test_one_query_for_all_tables(self):
+        inference.clear_metadata_cache()
+        cur = self.FakeCursor()
+        columns = inference._schema_columns(cur, 'staging')
+        assert columns == {'t1': [('period', 'text'), ('value', 'integer')], 't2': [('org', 'text')]}
+        assert inference._schema_columns(cur, 'staging') is columns
+        assert cur.executed == [('staging',)]
+        inference.clear_metadata_cache()
+        inference._schema_columns(cur, 'staging')
+        assert len(cur.executed) == 2
+        inference.clear_metadata_cache()
@@ -0,0 +1,230 @@
+"""Test streaming a DataFrame into COPY - no DB needed."""
+import pandas as pd
+import pytest
+
+from datawarp.loader import excel
+
+
+class FakeCursor:
+    """Records what COPY would have received."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.data = b''
+
+    def copy_expert(self, sql, file):
+        if self.fail:
+            raise RuntimeError('copy failed')
+        self.sql = sql
+        while True:
+            chunk = file.read(7)
+            if not chunk:
+                break
+            self.data += chunk
+
+
+class TestCopyDataframe:
+
+    def test_streams_same_csv_as_to_csv(self, monkeypatch):
+        monkeypatch.setattr(excel, 'COPY_CHUNK_ROWS', 3)
+        df = pd.DataFrame({'a': range(10), 'b': ['x', None, 'é'] * 3 + ['z']})
+        cur = FakeCursor()
+        excel._copy_dataframe(cur, df, 'COPY t FROM STDIN')
+        expected = df.to_csv(index=False, header=False, sep='\t', na_rep='\\N')
+        assert cur.data.decode('utf-8') == expected
+
+    def test_copy_error_propagates(self):
+        df = pd.DataFrame({'a': range(100000)})
+        with pytest.raises(RuntimeError, match='copy failed'):
+            excel._copy_dataframe(FakeCursor(fail=True), df, 'COPY t FROM STDIN')
+
+    def test_writer_error_propagates(self, monkeypatch):
+        def broken_to_csv(*args, **kwargs):
+            raise ValueError('cannot serialize')
+
+        df = pd.DataFrame({'a': [1, 2]})
+        monkeypatch.setattr(df, 'to_csv', broken_to_csv)
+        with pytest.raises(ValueError, match='cannot serialize'):
+            excel._copy_dataframe(FakeCursor(), df, 'COPY t FROM STDIN')
+
+
+class TestDownloadFiles:
+
+    def test_downloads_unique_names_and_skips_collisions(self, monkeypatch, tmp_path):
+        calls = []
+
+        def fake_download(url, target_dir=None):
+            calls.append(url)
+            if 'bad' in url:
+                raise OSError('404')
+            return str(tmp_path / url.split('/')[-1])
+
+        monkeypatch.setattr(excel, 'download_file', fake_download)
+        paths = excel.download_files([
+            'https://x/a/data.xlsx', 'https://x/b/data.xlsx',  # same filename
+            'https://x/c/other.csv', 'https://x/c/other.csv',  # duplicate URL
+            'https://x/bad.zip',
+        ], str(tmp_path))
+        assert paths == {'https://x/c/other.csv': str(tmp_path / 'other.csv')}
+        assert sorted(calls) == ['https://x/bad.zip', 'https://x/c/other.csv']
+
+
+class FakeLoadCursor(FakeCursor):
+    """Cursor for load_dataframe: records statements, reports no existing columns."""
+
+    def __init__(self):
+        super().__init__()
+        self.statements = []
+
+    def execute(self, sql, params=None):
+        self.statements.append(sql)
+
+    def fetchall(self):
+        return []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def load_cursor(monkeypatch):
+    from contextlib import contextmanager
+
+    cur = FakeLoadCursor()
+
+    class FakeConnection:
+        def cursor(self):
+            return cur
+
+    @contextmanager
+    def fake_connection():
+        yield FakeConnection()
+
+    monkeypatch.setattr(excel, 'get_connection', fake_connection)
+    monkeypatch.setattr(excel, '_table_columns', {})
+    return cur
+
+
+class TestLoadDataframe:
+
+    def test_columns_sanitized_mapped_and_deduplicated(self, load_cursor):
+        df = pd.DataFrame([[1, 2, 3, 'x']], columns=['Org Code', 'org-code', 'Total', 'Name'])
+        rows, mappings, types = excel.load_dataframe(
+            df, 't1', period='2025-01', column_mappings={'total': 'total_count'},
+        )
+        assert rows == 1
+        assert list(types) == ['org_code', 'org_code_1', 'total_count', 'name', 'period']
+        assert mappings == {'org_code': 'org_code', 'total': 'total_count', 'name': 'name'}
+        assert '"org_code", "org_code_1", "total_count", "name", "period"' in load_cursor.sql
+        assert load_cursor.data.decode().splitlines() == ['1\t2\t3\tx\t2025-01']
+
+    def test_known_table_skips_schema_discovery(self, load_cursor):
+        df = pd.DataFrame({'org_code': ['A', 'B'], 'total': [1, 2]})
+        excel.load_dataframe(df, 't1', period='2025-01')
+        first = [s.split()[0] for s in load_cursor.statements]
+        assert first == ['CREATE', 'SELECT', 'ALTER', 'ANALYZE']
+
+        load_cursor.statements.clear()
+        excel.load_dataframe(df, 't1', period='2025-02')
+        assert [s.split()[0] for s in load_cursor.statements] == ['DELETE', 'ANALYZE']
+
+        # A new column sends the load back through discovery
+        load_cursor.statements.clear()
+        excel.load_dataframe(df.assign(extra=[3, 4]), 't1', period='2025-03')
+        assert [s.split()[0] for s in load_cursor.statements] == ['CREATE', 'SELECT', 'ALTER', 'ANALYZE']
+
+    def test_failed_load_forgets_table(self, load_cursor):
+        df = pd.DataFrame({'org_code': ['A']})
+        excel.load_dataframe(df, 't1')
+        load_cursor.fail = True
+        with pytest.raises(RuntimeError):
+            excel.load_dataframe(df, 't1')
+        assert ('staging', 't1') not in excel._table_columns
+
+    def test_unlogged_staging_opt_in(self, load_cursor, monkeypatch):
+        df = pd.DataFrame({'org_code': ['A']})
+        excel.load_dataframe(df, 't1')
+        assert 'UNLOGGED' not in load_cursor.statements[0]
+
+        load_cursor.statements.clear()
+        monkeypatch.setattr(excel, 'UNLOGGED_STAGING', True)
+        excel.load_dataframe(df, 't2')
+        assert 'CREATE UNLOGGED TABLE IF NOT EXISTS staging.t2' in load_cursor.statements[0]
+
+
+class TestFileSha256:
+
+    def test_matches_hashlib(self, tmp_path):
+        import hashlib
+
+        path = tmp_path / 'data.csv'
+        path.write_bytes(b'a,b\n' * 500000)
+        assert excel.file_sha256(str(path)) == hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise OSError(self.status_code)
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class TestDownloadFile:
+
+    def test_conditional_redownload(self, monkeypatch, tmp_path):
+        requests_seen = []
+        responses = [
+            FakeResponse(200, b'v1', {'ETag': '"abc"'}),
+            FakeResponse(304),
+            FakeResponse(200, b'v2', {'Last-Modified': 'Tue, 01 Apr 2025 00:00:00 GMT'}),
+        ]
+
+        def fake_get(url, headers=None, **kwargs):
+            requests_seen.append(headers)
+            return responses.pop(0)
+
+        monkeypatch.setattr(excel.requests, 'get', fake_get)
+        url = 'https://x/data.csv?v=1'
+
+        path = excel.download_file(url, str(tmp_path))
+        assert path == str(tmp_path / 'data.csv')
+        assert requests_seen[0] == {}
+
+        # Unchanged on the server: nothing re-downloaded
+        assert excel.download_file(url, str(tmp_path)) == path
+        assert requests_seen[1] == {'If-None-Match': '"abc"'}
+        assert (tmp_path / 'data.csv').read_bytes() == b'v1'
+
+        excel.download_file(url, str(tmp_path))
+        assert (tmp_path / 'data.csv').read_bytes() == b'v2'
+        assert not (tmp_path / 'data.csv.part').exists()
+
+    def test_different_url_same_name_is_unconditional(self, monkeypatch, tmp_path):
+        seen = []
+
+        def fake_get(url, headers=None, **kwargs):
+            seen.append(headers)
+            return FakeResponse(200, url.encode(), {'ETag': url})
+
+        monkeypatch.setattr(excel.requests, 'get', fake_get)
+        excel.download_file('https://x/2025-01/data.csv', str(tmp_path))
+        excel.download_file('https://x/2025-02/data.csv', str(tmp_path))
+        assert seen == [{}, {}]
+        assert (tmp_path / 'data.csv').read_bytes() == b'https://x/2025-02/data.csv'
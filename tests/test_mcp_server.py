@@ -0,0 +1,247 @@
+"""Test the MCP server's query tool and caches against a fake database - no Postgres needed."""
+import importlib.util
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip('mcp')
+
+_spec = importlib.util.spec_from_file_location(
+    'mcp_server', Path(__file__).resolve().parents[1] / 'scripts' / 'mcp_server.py')
+mcp_server = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(mcp_server)
+
+
+class _Column(tuple):
+    """psycopg2 column description: indexes like a tuple, has a type_code."""
+    type_code = 23  # int4
+
+    def __new__(cls, name):
+        return super().__new__(cls, (name,))
+
+
+class FakeCursor:
+    """Serves `rows` for any query, honouring a trailing LIMIT like Postgres would."""
+
+    def __init__(self, db, name=None):
+        self.db = db
+        self.name = name
+        self.description = None
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params=None):
+        self.db.executed.append((self.name, sql))
+        if sql.startswith('SET '):
+            return
+        match = re.search(r'\bLIMIT (\d+)\s*$', sql)
+        rows = self.db.rows[:int(match.group(1))] if match else self.db.rows
+        self.description = [_Column(c) for c in self.db.columns]
+        self._rows = list(rows)
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+@pytest.fixture
+def db(monkeypatch):
+    state = SimpleNamespace(columns=['n'], rows=[(i,) for i in range(10)], executed=[])
+
+    @contextmanager
+    def fake_connection():
+        yield SimpleNamespace(cursor=lambda name=None: FakeCursor(state, name))
+
+    monkeypatch.setattr(mcp_server, 'get_connection', fake_connection)
+    return state
+
+
+class TestQuery:
+
+    def test_rejects_non_select(self, db):
+        assert 'error' in mcp_server.query('DELETE FROM t')
+        assert db.executed == []
+
+    def test_more_rows_than_limit_is_truncated(self, db):
+        result = mcp_server.query('SELECT n FROM t', limit=5)
+        assert result['row_count'] == 5
+        assert result['rows'][0] == {'n': 0}
+        assert result['truncated'] is True
+
+    def test_rows_within_limit_not_truncated(self, db):
+        result = mcp_server.query('SELECT n FROM t', limit=10)
+        assert result['row_count'] == 10
+        assert result['truncated'] is False
+
+    def test_trailing_terminator_stripped_before_limit(self, db):
+        mcp_server.query('SELECT n FROM t; -- all', limit=5)
+        sql = db.executed[-1][1]
+        assert ';' not in sql
+        assert sql.endswith('LIMIT 6')
+
+    def test_runs_as_capped_subquery(self, db):
+        result = mcp_server.query('SELECT n FROM t LIMIT 100', limit=3)
+        sql = db.executed[-1][1]
+        assert sql.startswith('SELECT * FROM (\nSELECT n FROM t LIMIT 100\n)')
+        assert sql.endswith('LIMIT 4')
+        assert result['row_count'] == 3
+        assert result['truncated'] is True
+
+    def test_large_limit_streams(self, db, monkeypatch):
+        monkeypatch.setattr(mcp_server, 'STREAM_MIN_LIMIT', 5)
+        result = mcp_server.query('SELECT n FROM t', limit=8)
+        name, _ = db.executed[-1]
+        assert name is not None  # server-side cursor
+        assert result['row_count'] == 8
+        assert result['truncated'] is True
+
+    def test_hidden_second_statement_rejected(self, db):
+        assert 'error' in mcp_server.query("SELECT E'\\'' ; COMMIT; DROP TABLE staging.x; SELECT 1")
+        assert db.executed == []
+
+    def test_runs_read_only(self, db):
+        mcp_server.query('SELECT n FROM t')
+        name, sql = db.executed[0]
+        assert name is None
+        assert sql.startswith('SET TRANSACTION READ ONLY')
+
+
+@pytest.fixture
+def versioned(monkeypatch):
+    """Controllable data version and a clean periods cache."""
+    state = SimpleNamespace(version=(1,), builds=[])
+    monkeypatch.setattr(mcp_server, '_data_version', lambda schema: state.version)
+    mcp_server.clear_cache()
+    yield state
+    mcp_server.clear_cache()
+
+
+def _cached_periods(state, table, schema='staging'):
+    def build():
+        state.builds.append(table)
+        return [f'{table}-2025-01']
+    return mcp_server._versioned(mcp_server._periods_cache, (schema, table), schema, build)
+
+
+class TestPeriodsCacheBounds:
+
+    def test_entries_from_older_versions_are_dropped(self, versioned):
+        _cached_periods(versioned, 't1')
+        _cached_periods(versioned, 't2', schema='other')
+        versioned.version = (2,)
+        _cached_periods(versioned, 't3')
+        # t1 was built from version 1 of staging; the other schema is left alone
+        assert set(mcp_server._periods_cache) == {('staging', 't3'), ('other', 't2')}
+
+    def test_size_is_capped(self, versioned, monkeypatch):
+        monkeypatch.setattr(mcp_server, 'RESULTS_CACHE_MAX_ENTRIES', 3)
+        for i in range(5):
+            _cached_periods(versioned, f't{i}')
+        assert set(mcp_server._periods_cache) == {('staging', 't2'), ('staging', 't3'), ('staging', 't4')}
+
+
+class TestDataVersionCache:
+
+    def test_served_without_version_check_within_ttl(self, versioned, monkeypatch):
+        checks = []
+        monkeypatch.setattr(mcp_server, '_data_version', lambda schema: checks.append(schema) or (1,))
+        _cached_periods(versioned, 't1')
+        _cached_periods(versioned, 't1')
+        assert versioned.builds == ['t1']
+        assert checks == ['staging']
+
+    def test_rebuilt_only_when_version_changes(self, versioned, monkeypatch):
+        monkeypatch.setattr(mcp_server, 'DATASETS_CACHE_TTL', -1)  # always expired
+        _cached_periods(versioned, 't1')
+        _cached_periods(versioned, 't1')
+        assert versioned.builds == ['t1']
+        versioned.version = (2,)
+        _cached_periods(versioned, 't1')
+        assert versioned.builds == ['t1', 't1']
+
+    def test_clear_cache_forces_rebuild(self, versioned):
+        _cached_periods(versioned, 't1')
+        mcp_server.clear_cache()
+        _cached_periods(versioned, 't1')
+        assert versioned.builds == ['t1', 't1']
+
+
+class TestConfigIndex:
+
+    @pytest.fixture
+    def configs(self, monkeypatch):
+        state = SimpleNamespace(version=(1,), reads=0)
+        sm = SimpleNamespace(table_name='tbl_referrals', column_mappings={'Org Code': 'org_code', 'period': 'period'},
+                             column_descriptions={'org_code': 'Provider code'})
+        cfg = SimpleNamespace(file_patterns=[SimpleNamespace(sheet_mappings=[sm])])
+
+        def fake_list_configs():
+            state.reads += 1
+            return [cfg]
+
+        monkeypatch.setattr(mcp_server, 'get_configs_version', lambda: state.version)
+        monkeypatch.setattr(mcp_server, 'list_configs', fake_list_configs)
+        mcp_server.clear_cache()
+        yield state
+        mcp_server.clear_cache()
+
+    def test_configs_reread_only_when_version_changes(self, configs):
+        _, _, sm, counts, lookup = mcp_server._lookup_by_table('tbl_referrals')
+        assert counts == {'columns_total': 2, 'columns_enriched': 1, 'columns_pending': 1}
+        assert lookup['org_code'] == ('Org Code', 'Provider code')
+        mcp_server._lookup_by_table('tbl_referrals')
+        assert configs.reads == 1
+        configs.version = (2,)
+        mcp_server._lookup_by_table('tbl_referrals')
+        assert configs.reads == 2
+
+    def test_unknown_table(self, configs):
+        assert mcp_server._lookup_by_table('tbl_missing') == (None,) * 5
+
+
+class TestSnapshot:
+
+    @pytest.fixture
+    def listing(self, versioned, tmp_path, monkeypatch):
+        versioned.queries = []
+
+        def fake_query_datasets(schema, exact=False, name_prefix=None, only_enriched=False, changed_since=None):
+            versioned.queries.append((schema, exact, name_prefix))
+            return [{'name': 'tbl_referrals', 'row_count': 42}]
+
+        monkeypatch.setattr(mcp_server, 'SNAPSHOT_PATH', tmp_path / 'mcp_snapshot.json')
+        monkeypatch.setattr(mcp_server, '_query_datasets', fake_query_datasets)
+        return versioned
+
+    def test_new_process_starts_from_matching_snapshot(self, listing):
+        assert mcp_server.write_snapshot() == 1
+        mcp_server.clear_cache()  # as a new server process
+        listing.queries.clear()
+        assert mcp_server.list_datasets() == [{'name': 'tbl_referrals', 'row_count': 42}]
+        assert listing.queries == []
+
+    def test_stale_snapshot_is_rebuilt(self, listing):
+        mcp_server.write_snapshot()
+        mcp_server.clear_cache()
+        listing.queries.clear()
+        listing.version = (2,)
+        mcp_server.list_datasets()
+        assert listing.queries == [('staging', False, None)]
+
+    def test_filtered_listing_ignores_snapshot(self, listing):
+        mcp_server.write_snapshot()
+        mcp_server.clear_cache()
+        listing.queries.clear()
+        mcp_server.list_datasets(name_prefix='tbl_adhd')
+        assert listing.queries == [('staging', False, 'tbl_adhd')]
+
+    def test_missing_snapshot(self, listing):
+        mcp_server.list_datasets()
+        assert listing.queries == [('staging', False, None)]
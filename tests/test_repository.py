@@ -0,0 +1,102 @@
+"""Test batched load-history writes and the pipeline status summary - no DB needed."""
+from contextlib import contextmanager
+from datetime import datetime
+
+import pytest
+from psycopg2 import errors as pg_errors
+
+from datawarp.pipeline import repository
+from datawarp.pipeline.repository import LoadRecord
+
+
+class FakeConnection:
+    def cursor(self):
+        @contextmanager
+        def cur():
+            yield None
+        return cur()
+
+
+@pytest.fixture
+def written(monkeypatch):
+    batches = []
+
+    @contextmanager
+    def fake_connection():
+        yield FakeConnection()
+
+    monkeypatch.setattr(repository, 'get_connection', fake_connection)
+    monkeypatch.setattr(repository, 'execute_values', lambda cur, sql, rows: batches.append(rows))
+    return batches
+
+
+class TestRecordLoads:
+
+    def test_single_batch(self, written):
+        repository.record_loads([
+            LoadRecord('p1', '2025-01', 't1', 'a.xlsx', 'Table 1', 10),
+            LoadRecord('p1', '2025-01', 't2', 'a.xlsx', 'Table 2', 20),
+        ])
+        assert len(written) == 1
+        assert [r.table_name for r in written[0]] == ['t1', 't2']
+
+    def test_last_record_per_key_wins(self, written):
+        repository.record_loads([
+            LoadRecord('p1', '2025-01', 't1', 'a.xlsx', 'Table 1', 10),
+            LoadRecord('p1', '2025-01', 't1', 'b.xlsx', 'Table 1', 15),
+        ])
+        assert [(r.source_file, r.rows_loaded) for r in written[0]] == [('b.xlsx', 15)]
+
+    def test_null_sheet_names_are_kept(self, written):
+        repository.record_loads([
+            LoadRecord('p1', '2025-01', 't1', 'a.csv', None, 10),
+            LoadRecord('p1', '2025-01', 't1', 'b.csv', None, 15),
+        ])
+        assert len(written[0]) == 2
+
+    def test_empty_is_noop(self, written):
+        repository.record_loads([])
+        assert written == []
+
+
+class NoViewCursor:
+    """Fails on mv_pipeline_status as a database without the view would."""
+
+    def __init__(self, executed):
+        self.executed = executed
+
+    def execute(self, sql):
+        self.executed.append(sql)
+        if 'mv_pipeline_status' in sql:
+            raise pg_errors.UndefinedTable('relation "datawarp.mv_pipeline_status" does not exist')
+
+    def fetchall(self):
+        return [('p1', 3, 2, datetime(2025, 1, 31))]
+
+
+@pytest.fixture
+def no_view(monkeypatch):
+    executed = []
+
+    @contextmanager
+    def fake_connection():
+        @contextmanager
+        def cursor():
+            yield NoViewCursor(executed)
+        yield type('Conn', (), {'cursor': staticmethod(cursor)})()
+
+    monkeypatch.setattr(repository, 'get_connection', fake_connection)
+    return executed
+
+
+class TestPipelineStatusWithoutView:
+
+    def test_refresh_is_noop(self, no_view):
+        repository.refresh_pipeline_status()
+        assert len(no_view) == 1
+
+    def test_status_falls_back_to_load_history(self, no_view):
+        status = repository.get_pipeline_status()
+        assert 'tbl_load_history' in no_view[-1]
+        assert status == {'p1': {'period_count': 3, 'table_count': 2,
+                                 'last_loaded_at': datetime(2025, 1, 31)}}
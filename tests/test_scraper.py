@@ -0,0 +1,70 @@
+"""Test period sub-page caching in the scraper - no network needed."""
+from types import SimpleNamespace
+
+import pytest
+
+from datawarp.discovery import scraper
+
+PAGE = b'<html><body><a href="/data/referrals-nov-2025.xlsx">Referrals November 2025</a></body></html>'
+REVISED = b'<html><body><a href="/data/referrals-nov-2025-final.xlsx">Referrals November 2025</a></body></html>'
+
+
+@pytest.fixture
+def server(tmp_path, monkeypatch):
+    """Fake sub-page server: answers conditional requests with 304 while the ETag matches."""
+    state = SimpleNamespace(content=PAGE, etag='"v1"', requests=[])
+
+    def fake_get(url, headers=None):
+        headers = headers or {}
+        state.requests.append((url, headers))
+        if 'broken' in url:
+            return None
+        response_headers = {'ETag': state.etag} if state.etag else {}
+        if state.etag and headers.get('If-None-Match') == state.etag:
+            return SimpleNamespace(status_code=304, content=b'', headers=response_headers)
+        return SimpleNamespace(status_code=200, content=state.content, headers=response_headers)
+
+    monkeypatch.setattr(scraper, '_get_page', fake_get)
+    monkeypatch.setattr(scraper, 'CACHE_DIR', tmp_path)
+    return state
+
+
+URL = 'https://example.nhs.uk/stats/november-2025'
+
+
+class TestSubpageCache:
+
+    def test_unchanged_page_revalidated_and_served_from_cache(self, server):
+        first = scraper._scrape_subpage(URL, '2025-11')
+        second = scraper._scrape_subpage(URL, '2025-11')
+        assert [h for _, h in server.requests] == [{}, {'If-None-Match': '"v1"'}]
+        assert first == second
+        assert second[0].filename == 'referrals-nov-2025.xlsx'
+        assert second[0].period == '2025-11'
+
+    def test_changed_page_rescraped(self, server):
+        scraper._scrape_subpage(URL, '2025-11')
+        server.content, server.etag = REVISED, '"v2"'
+        files = scraper._scrape_subpage(URL, '2025-11')
+        assert files[0].filename == 'referrals-nov-2025-final.xlsx'
+        # The new validators are kept for the next revalidation
+        scraper._scrape_subpage(URL, '2025-11')
+        assert server.requests[-1][1] == {'If-None-Match': '"v2"'}
+
+    def test_failed_fetch_not_cached(self, server):
+        url = 'https://example.nhs.uk/stats/broken-2025'
+        assert scraper._scrape_subpage(url) == []
+        assert scraper._scrape_subpage(url) == []
+        assert [h for _, h in server.requests] == [{}, {}]
+
+    def test_page_without_validators_not_cached(self, server):
+        server.etag = None
+        scraper._scrape_subpage(URL)
+        scraper._scrape_subpage(URL)
+        assert [h for _, h in server.requests] == [{}, {}]
+
+    def test_ttl_serves_without_request(self, server, monkeypatch):
+        monkeypatch.setattr(scraper, 'SUBPAGE_CACHE_TTL', 3600)
+        scraper._scrape_subpage(URL)
+        scraper._scrape_subpage(URL)
+        assert len(server.requests) == 1
@@ -0,0 +1,54 @@
+"""Test SQL checks used by the MCP query tool."""
+import pytest
+from datawarp.utils.sql_check import is_single_select, strip_trailing_terminator
+
+
+class TestIsSingleSelect:
+
+    @pytest.mark.parametrize('sql', [
+        'SELECT 1',
+        'select 1;',
+        '/* report */ select * from t',
+        'WITH a AS (SELECT 1), b AS (SELECT 2) SELECT * FROM a, b',
+        "select ';' as x",
+        "select E'it\\'s; ok' as x",
+        "select 'a\\' as x",
+    ])
+    def test_accepted(self, sql):
+        assert is_single_select(sql)
+
+    @pytest.mark.parametrize('sql', [
+        '',
+        'delete from t',
+        'select 1; delete from t',
+        'select 1; -- ok\ndrop table t',
+        'with a as (select 1) delete from t',
+        'selectx from t',
+        "select E'\\'' ; commit; drop table t; select 1",
+        "select 'unclosed; drop table t",
+        'select 1 /* unclosed; drop table t',
+        'select $q$ unclosed; drop table t',
+    ])
+    def test_rejected(self, sql):
+        assert not is_single_select(sql)
+
+
+class TestStripTrailingTerminator:
+
+    @pytest.mark.parametrize('sql, expected', [
+        ('SELECT 1', 'SELECT 1'),
+        ('select 1;  ', 'select 1'),
+        ('SELECT 1; -- c', 'SELECT 1'),
+        ('select 1 /* a */ ; ;\n-- b\n', 'select 1'),
+        ("select ';'", "select ';'"),
+        ("select * from t -- note", 'select * from t'),
+        ('select (1 -- x\n)', 'select (1 -- x\n)'),
+        ('select 1 - -1', 'select 1 - -1'),
+    ])
+    def test_strip(self, sql, expected):
+        assert strip_trailing_terminator(sql) == expected
+
+    def test_single_select_stays_single_with_limit(self):
+        sql = 'SELECT 1; -- c'
+        assert is_single_select(sql)
+        assert is_single_select(f"{strip_trailing_terminator(sql)}\nLIMIT 100")